@@ -1,6 +1,13 @@
 """Hashing Agent - Provides cryptographic privacy through deterministic hashing."""
+import base64
 import hashlib
 from datetime import datetime
+from typing import Iterable, Iterator
+
+# Bound once - these are called per slot in the hashing loops
+_sha256 = hashlib.sha256
+_b64encode = base64.urlsafe_b64encode
+_isoformat = datetime.isoformat
 
 
 class HashingAgent:
@@ -13,11 +20,21 @@ class HashingAgent:
     - User Agents receive the full hash→time mapping
     """
     
+    def _prefix_state(self, meeting_id: str):
+        """SHA-256 context with the shared `meeting_id||` prefix already absorbed."""
+        return _sha256(f"{meeting_id}||".encode())
+    
+    def _hash_with_base(self, base, time_str: str) -> str:
+        """Finish a copy of the prefix context with a single time string."""
+        h = base.copy()
+        h.update(time_str.encode())
+        # First 72 bits as 12 url-safe base64 chars (no padding, no hex of the
+        # discarded bytes). Collision odds for 1000 slots are ~2^-53.
+        return _b64encode(h.digest()[:9]).decode()
+    
     def hash_time(self, meeting_id: str, time: datetime) -> str:
         """Generate a deterministic hash for a meeting_id + time combination."""
-        time_str = time.isoformat()
-        data = f"{meeting_id}||{time_str}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]  # Truncate for readability
+        return self._hash_with_base(self._prefix_state(meeting_id), time.isoformat())
     
     def generate_hashes(
         self,
@@ -29,19 +46,54 @@ class HashingAgent:
         
         Returns:
             {
-                "hashes": ["abc123...", "def456...", ...],  # For Meeting Agent (no mapping)
-                "mapping": {"abc123...": "2026-01-16T09:00:00", ...}  # For User Agents
+                "hashes": ["q1Zx-3Yb0Kd_", ...],  # For Meeting Agent (no mapping)
+                "mapping": {"q1Zx-3Yb0Kd_": "2026-01-16T09:00:00", ...},  # For User Agents
+                "time_to_hash": {"2026-01-16T09:00:00": "q1Zx-3Yb0Kd_", ...}  # Reverse, for User Agents
             }
         """
+        return self.generate_hashes_prebuilt(meeting_id, list(map(_isoformat, times)))
+    
+    def generate_hashes_prebuilt(
+        self,
+        meeting_id: str,
+        time_strs: list[str]
+    ) -> dict:
+        """Same as generate_hashes, for callers that already hold the ISO time strings."""
         mapping = {}
-        for time in times:
-            hash_val = self.hash_time(meeting_id, time)
-            mapping[hash_val] = time.isoformat()
+        time_to_hash = {}
+        for hash_val, time_str in self.iter_hashes_prebuilt(meeting_id, time_strs):
+            mapping[hash_val] = time_str
+            time_to_hash[time_str] = hash_val
         
         return {
             "hashes": list(mapping.keys()),
-            "mapping": mapping
+            "mapping": mapping,
+            "time_to_hash": time_to_hash
         }
+    
+    def iter_hashes(
+        self,
+        meeting_id: str,
+        times: Iterable[datetime]
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Lazily yield (hash, ISO time) pairs, one slot at a time.
+        
+        For wide windows a consumer (e.g. a queue to the Meeting Agent) can
+        start on the first hash before the rest are computed.
+        """
+        return self.iter_hashes_prebuilt(meeting_id, map(_isoformat, times))
+    
+    def iter_hashes_prebuilt(
+        self,
+        meeting_id: str,
+        time_strs: Iterable[str]
+    ) -> Iterator[tuple[str, str]]:
+        """Same as iter_hashes, for callers that already hold the ISO time strings."""
+        # Absorb the prefix once; each slot only pays for its own time string
+        base = self._prefix_state(meeting_id)
+        for time_str in time_strs:
+            yield self._hash_with_base(base, time_str), time_str
 
 
 # Singleton instance
@@ -1,15 +1,29 @@
 """Meeting Agent - Coordinates scheduling across participants without seeing calendars."""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-import uuid
 from sqlalchemy.orm import Session
 
-from database import MeetingDB, CalendarEventDB, UserDB
+from config import config
+from database import SessionLocal, MeetingDB, CalendarEventDB, UserDB
 from agents.hashing_agent import hashing_agent
 from agents.user_proxy_agent import UserProxyAgent
 from models import MeetingRequest, UtilityResponse
 
 
+# Candidate start times are spaced this far apart across the window
+SLOT_INTERVAL_MINUTES = 30
+
+
+# Shared by every coordinate_meeting call: worker threads are reused across
+# requests instead of spawned per meeting, and concurrent meetings together
+# never run more than AGENT_WORKERS participant agents at once
+_participant_pool = ThreadPoolExecutor(
+    max_workers=config.AGENT_WORKERS,
+    thread_name_prefix="participant-agent"
+)
+
+
 class MeetingAgent:
     """
     Coordination agent that schedules meetings.
@@ -28,19 +42,17 @@ class MeetingAgent:
         window_start: datetime,
         window_end: datetime,
         duration_minutes: int,
-        interval_minutes: int = 30
+        interval_minutes: int = SLOT_INTERVAL_MINUTES
     ) -> list[datetime]:
         """Generate all possible time slots in the scheduling window."""
-        slots = []
-        current = window_start
+        step = timedelta(minutes=interval_minutes)
+        # Number of start times whose meeting still ends inside the window
+        count = (window_end - window_start - timedelta(minutes=duration_minutes)) // step + 1
         
-        while current + timedelta(minutes=duration_minutes) <= window_end:
-            # Only schedule during business hours (9 AM - 5 PM)
-            if 9 <= current.hour < 17:
-                slots.append(current)
-            current += timedelta(minutes=interval_minutes)
+        slots = (window_start + i * step for i in range(max(count, 0)))
         
-        return slots
+        # Only schedule during business hours (9 AM - 5 PM)
+        return [slot for slot in slots if 9 <= slot.hour < 17]
     
     def coordinate_meeting(
         self,
@@ -67,46 +79,59 @@ class MeetingAgent:
         if not times:
             return {"error": "No valid time slots in window"}
         
-        # Step 2: Get hashes from Hashing Agent
-        hash_result = hashing_agent.generate_hashes(meeting_id, times)
+        # Step 2: Get hashes from Hashing Agent (ISO strings are formatted once, here)
+        time_strs = [t.isoformat() for t in times]
+        hash_result = hashing_agent.generate_hashes_prebuilt(meeting_id, time_strs)
         
         # Meeting Agent only sees the hashes, NOT the mapping
         hashes_only = hash_result["hashes"]
         hash_to_time = hash_result["mapping"]  # This goes to User Agents only
+        time_to_hash = hash_result["time_to_hash"]  # Reverse, built once per meeting
+        # Saves every User Agent from re-parsing the ISO strings
+        hash_to_datetime = {time_to_hash[s]: t for s, t in zip(time_strs, times)}
         
         # Step 3: Collect utilities from all participants
+        # Each User Proxy Agent is independent (and mostly waiting on the LLM),
+        # so run them concurrently
         all_participants = [request.organizer_id] + request.participant_ids
-        participant_utilities: list[UtilityResponse] = []
-        any_escalation = False
+        meeting_request = request.model_dump()
         
-        for participant_id in all_participants:
-            agent = UserProxyAgent(participant_id, self.db)
-            utility_response = agent.calculate_utilities(
-                meeting_request=request.model_dump(),
-                hash_to_time=hash_to_time,
-                duration_minutes=request.duration_minutes
-            )
-            participant_utilities.append(utility_response)
-            
-            if utility_response.escalate:
-                any_escalation = True
-        
-        # Step 4: Aggregate utilities (weighted by role)
-        aggregated = self._aggregate_utilities(
-            participant_utilities,
-            organizer_id=request.organizer_id
+        # Every participant's user, in-window events and history in one batch
+        # of queries, instead of a round of queries per participant
+        agents = UserProxyAgent.load_many(
+            all_participants, self.db, request.window_start, request.window_end
         )
         
-        # Step 5: Find winning hash
-        winning_hash = max(aggregated, key=aggregated.get)
-        winning_score = aggregated[winning_hash]
+        participant_utilities: list[UtilityResponse] = list(_participant_pool.map(
+            lambda participant_id: self._collect_utilities(
+                agents[participant_id],
+                meeting_request,
+                hash_to_time,
+                time_to_hash,
+                hash_to_datetime,
+                request.duration_minutes
+            ),
+            all_participants
+        ))
+        
+        any_escalation = any(u.escalate for u in participant_utilities)
+        
+        # Step 4: Aggregate utilities (weighted by role). Weights and score maps
+        # are pulled out of the responses once, as parallel lists, so the
+        # aggregation loop never goes through the pydantic objects.
+        weights = self._participant_weights(all_participants, request.organizer_id)
+        score_maps = [u.utilities for u in participant_utilities]
+        aggregated = self._aggregate_utilities(score_maps, weights)
+        
+        # Step 5: Rank hashes; the winner is the top option (ties keep slot order)
+        sorted_options = sorted(aggregated.items(), key=lambda x: x[1], reverse=True)
+        winning_hash, winning_score = sorted_options[0]
         
         # Step 6: Build response
         # NOTE: We return the mapping for demo purposes
         # In production, only the initiator would receive this
         
         # Get top options for user choice (when escalating)
-        sorted_options = sorted(aggregated.items(), key=lambda x: x[1], reverse=True)
         top_options = [
             {
                 "hash": h,
@@ -155,32 +180,92 @@ class MeetingAgent:
             ]
         }
     
-    def _aggregate_utilities(
+    @staticmethod
+    def with_meeting_id(result: dict, meeting_id: str) -> dict:
+        """
+        A coordinate_meeting result re-issued under a new meeting_id.
+        
+        Slot hashes are salted with the meeting_id, so every hash in the
+        result is recomputed to match; scores and reasoning are reused.
+        """
+        if "initiator_view" not in result:
+            return result
+        hash_to_time = result["initiator_view"]["hash_to_time"]
+        new_hashes = {
+            old_hash: new_hash
+            for old_hash, (new_hash, _) in zip(
+                hash_to_time,
+                hashing_agent.iter_hashes_prebuilt(meeting_id, list(hash_to_time.values()))
+            )
+        }
+        
+        def rekey(value):
+            if isinstance(value, dict):
+                return {new_hashes.get(k, k): rekey(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [rekey(v) for v in value]
+            if isinstance(value, str):
+                return new_hashes.get(value, value)
+            return value
+        
+        return {**rekey(result), "meeting_id": meeting_id}
+    
+    def _collect_utilities(
+        self,
+        agent: UserProxyAgent,
+        meeting_request: dict,
+        hash_to_time: dict[str, str],
+        time_to_hash: dict[str, str],
+        hash_to_datetime: dict[str, datetime],
+        duration_minutes: int
+    ) -> UtilityResponse:
+        """
+        Run one participant's preloaded User Proxy Agent.
+        
+        Scoring reads the preloaded data; anything it still has to query goes
+        through a session of this thread's own (sessions aren't thread-safe).
+        """
+        db = SessionLocal(bind=self.db.get_bind())
+        try:
+            agent.db = db
+            return agent.calculate_utilities(
+                meeting_request=meeting_request,
+                hash_to_time=hash_to_time,
+                duration_minutes=duration_minutes,
+                time_to_hash=time_to_hash,
+                hash_to_datetime=hash_to_datetime
+            )
+        finally:
+            db.close()
+    
+    def _participant_weights(
         self,
-        utilities: list[UtilityResponse],
+        participant_ids: list[str],
         organizer_id: str
-    ) -> dict[str, float]:
+    ) -> list[float]:
         """
-        Aggregate utilities from all participants with weighting.
+        Aggregation weight for each participant, in the same order.
         
         Weights:
         - Organizer: 3.0
         - Required participants: 1.5
         - Optional: 1.0 (default)
         """
-        # Collect all hashes
-        all_hashes = set()
-        for u in utilities:
-            all_hashes.update(u.utilities.keys())
-        
-        # Aggregate with weights
-        aggregated = {h: 0.0 for h in all_hashes}
+        return [3.0 if p == organizer_id else 1.5 for p in participant_ids]
+    
+    def _aggregate_utilities(
+        self,
+        score_maps: list[dict[str, int]],
+        weights: list[float]
+    ) -> dict[str, float]:
+        """Aggregate utilities from all participants (parallel to `weights`)."""
+        # Aggregate with weights in a single pass (keys keep first-seen slot order)
+        aggregated: dict[str, float] = {}
+        get = aggregated.get
         
-        for u in utilities:
-            weight = 3.0 if u.user_id == organizer_id else 1.5
-            
-            for hash_val, score in u.utilities.items():
-                aggregated[hash_val] += score * weight
+        for scores, weight in zip(score_maps, weights):
+            for hash_val, score in scores.items():
+                aggregated[hash_val] = get(hash_val, 0.0) + score * weight
         
         return aggregated
     
@@ -211,21 +296,22 @@ class MeetingAgent:
         )
         self.db.add(meeting)
         
-        # Create calendar events for all participants
+        # Create calendar events for all participants (one bulk INSERT, no identity map)
         all_participants = [organizer_id] + participant_ids
-        for participant_id in all_participants:
-            event = CalendarEventDB(
-                id=f"{meeting_id}_{participant_id}",
-                user_id=participant_id,
-                title=title,
-                start_time=winning_time,
-                end_time=end_time,
-                event_type="scheduled_meeting",
-                external=False,
-                importance=5,
-                recurring=False
-            )
-            self.db.add(event)
+        self.db.bulk_insert_mappings(CalendarEventDB, [
+            {
+                "id": f"{meeting_id}_{participant_id}",
+                "user_id": participant_id,
+                "title": title,
+                "start_time": winning_time,
+                "end_time": end_time,
+                "event_type": "scheduled_meeting",
+                "external": False,
+                "importance": 5,
+                "recurring": False
+            }
+            for participant_id in all_participants
+        ])
         
         self.db.commit()
         
@@ -1,13 +1,42 @@
 """User Proxy Agent - Manages individual calendar and calculates utilities privately."""
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
+import heapq
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
 
 from database import CalendarEventDB, DecisionHistoryDB, UserDB
 from llm_service import get_llm
 from models import UtilityResponse
 
 
+# What _decision_to_dict reads from a past decision
+DECISION_COLUMNS = (
+    DecisionHistoryDB.id,
+    DecisionHistoryDB.meeting_type,
+    DecisionHistoryDB.conflicting_type,
+    DecisionHistoryDB.recommended_action,
+    DecisionHistoryDB.user_action,
+    DecisionHistoryDB.notes,
+)
+
+# Decisions preloaded per participant: what calculate_utilities reads
+# (get_decision_history's default); longer histories are still queried
+PRELOADED_DECISIONS = 10
+
+
+def _naive(dt: datetime) -> datetime:
+    """
+    Drop any UTC offset from a request time.
+    
+    Calendar times are stored naive (SQLite also drops the offset when it
+    binds an aware value), so aware inputs are compared as wall-clock times.
+    """
+    return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
 class UserProxyAgent:
     """
     Agent that runs on behalf of a single user.
@@ -19,16 +48,97 @@ class UserProxyAgent:
     - Decides when to escalate
     """
     
-    def __init__(self, user_id: str, db: Session):
+    def __init__(self, user_id: str, db: Session, user: Optional[UserDB] = None):
         self.user_id = user_id
         self.db = db
         self.llm = get_llm()
         
+        # Per-instance memo (an agent lives for one coordination cycle)
+        self._decision_cache: dict[int, list[dict]] = {}
+        self._prefs_cache: Optional[dict] = None
+        
+        # Filled in by load(): the PRELOADED_DECISIONS most recent decisions
+        # (newest first) and the events overlapping a preloaded window (sorted
+        # by start time)
+        self._recent_history: Optional[list[dict]] = None
+        self._window: Optional[tuple[datetime, datetime]] = None
+        self._window_events: list[CalendarEventDB] = []
+        
         # Load user
-        self.user = db.query(UserDB).filter(UserDB.id == user_id).first()
+        self.user = user or db.query(UserDB).filter(UserDB.id == user_id).first()
         if not self.user:
             raise ValueError(f"User {user_id} not found")
     
+    @classmethod
+    def load(
+        cls,
+        user_id: str,
+        db: Session,
+        window_start: datetime,
+        window_end: datetime
+    ) -> "UserProxyAgent":
+        """
+        Build an agent with its user, in-window events and recent decision
+        history fetched up front (three queries).
+        """
+        return cls.load_many([user_id], db, window_start, window_end)[user_id]
+    
+    @classmethod
+    def load_many(
+        cls,
+        user_ids: list[str],
+        db: Session,
+        window_start: datetime,
+        window_end: datetime
+    ) -> dict[str, "UserProxyAgent"]:
+        """
+        Preloaded agents (see load) for several users, keyed by user id.
+        
+        Still three queries in total - the events and decisions SELECTs cover
+        every user at once with IN - rather than three per user.
+        """
+        window_start, window_end = _naive(window_start), _naive(window_end)
+        user_id_set = set(user_ids)
+        
+        users = db.query(UserDB).options(
+            selectinload(UserDB.events.and_(
+                CalendarEventDB.start_time < window_end,
+                CalendarEventDB.end_time > window_start
+            ))
+        ).filter(UserDB.id.in_(user_id_set)).all()
+        users_by_id = {user.id: user for user in users}
+        
+        # Each user's most recent decisions only, ranked per user in SQL
+        ranked = select(
+            DecisionHistoryDB.user_id,
+            *DECISION_COLUMNS,
+            func.row_number().over(
+                partition_by=DecisionHistoryDB.user_id,
+                order_by=DecisionHistoryDB.timestamp.desc()
+            ).label("recency")
+        ).where(DecisionHistoryDB.user_id.in_(user_id_set)).subquery()
+        recent_rows = db.execute(
+            select(ranked)
+            .where(ranked.c.recency <= PRELOADED_DECISIONS)
+            .order_by(ranked.c.user_id, ranked.c.recency)
+        ).all()
+        history_by_user: dict[str, list] = {}
+        for row in recent_rows:
+            history_by_user.setdefault(row.user_id, []).append(row)
+        
+        agents = {}
+        for user_id in user_ids:
+            if user_id not in users_by_id:
+                raise ValueError(f"User {user_id} not found")
+            agent = cls(user_id, db, user=users_by_id[user_id])
+            agent._window = (window_start, window_end)
+            agent._window_events = sorted(agent.user.events, key=lambda e: e.start_time)
+            agent._recent_history = [
+                agent._decision_to_dict(d) for d in history_by_user.get(user_id, [])
+            ]
+            agents[user_id] = agent
+        return agents
+    
     def get_calendar(self, start: datetime, end: datetime) -> list[dict]:
         """Get calendar events in a time range."""
         events = self.db.query(CalendarEventDB).filter(
@@ -37,80 +147,130 @@ class UserProxyAgent:
             CalendarEventDB.end_time > start
         ).all()
         
-        return [
-            {
-                "id": e.id,
-                "title": e.title,
-                "start_time": e.start_time.isoformat(),
-                "end_time": e.end_time.isoformat(),
-                "event_type": e.event_type,
-                "external": e.external,
-                "importance": e.importance,
-                "recurring": e.recurring
-            }
-            for e in events
-        ]
+        return [self._event_to_dict(e) for e in events]
     
     def get_decision_history(self, limit: int = 10) -> list[dict]:
         """Get recent scheduling decisions for learning."""
-        decisions = self.db.query(DecisionHistoryDB).filter(
+        if self._recent_history is not None and limit <= PRELOADED_DECISIONS:
+            return self._recent_history[:limit]
+        
+        # A longer cached history already holds the most recent `limit` rows
+        for cached_limit, cached in self._decision_cache.items():
+            if cached_limit >= limit:
+                return cached[:limit]
+        
+        # Only the serialized columns, as plain rows - no ORM instances
+        decisions = self.db.query(*DECISION_COLUMNS).filter(
             DecisionHistoryDB.user_id == self.user_id
         ).order_by(DecisionHistoryDB.timestamp.desc()).limit(limit).all()
         
-        return [
-            {
-                "id": d.id,
-                "meeting_type": d.meeting_type,
-                "conflicting_type": d.conflicting_type,
-                "recommended_action": d.recommended_action,
-                "user_action": d.user_action,
-                "notes": d.notes
-            }
-            for d in decisions
-        ]
+        self._decision_cache[limit] = [self._decision_to_dict(d) for d in decisions]
+        return self._decision_cache[limit][:]
     
     def get_conflict_at(self, time: datetime, duration_minutes: int) -> Optional[dict]:
         """Check if there's a calendar conflict at a specific time."""
+        time = _naive(time)
         end_time = time + timedelta(minutes=duration_minutes)
-        
-        conflicts = self.db.query(CalendarEventDB).filter(
-            CalendarEventDB.user_id == self.user_id,
-            CalendarEventDB.start_time < end_time,
-            CalendarEventDB.end_time > time
-        ).all()
+        conflicts = self._events_overlapping(time, end_time)
         
         if conflicts:
             # Return the most important conflict
-            conflict = max(conflicts, key=lambda e: e.importance)
-            return {
-                "id": conflict.id,
-                "title": conflict.title,
-                "start_time": conflict.start_time.isoformat(),
-                "end_time": conflict.end_time.isoformat(),
-                "event_type": conflict.event_type,
-                "external": conflict.external,
-                "importance": conflict.importance,
-                "recurring": conflict.recurring
-            }
+            return self._event_to_dict(max(conflicts, key=lambda e: e.importance))
         return None
     
+    def get_conflicts_for_slots(
+        self,
+        times: list[datetime],
+        duration_minutes: int
+    ) -> list[Optional[dict]]:
+        """
+        Resolve the most important conflict for many slots with one query.
+        
+        Fetches every event overlapping the whole window once, sorted by start
+        time, then bisects per slot instead of issuing a SELECT per slot.
+        """
+        if not times:
+            return []
+        
+        times = [_naive(time) for time in times]
+        duration = timedelta(minutes=duration_minutes)
+        events = self._events_overlapping(min(times), max(times) + duration)
+        
+        starts = [e.start_time for e in events]
+        # No event starting before (slot - longest) can still be running at the slot
+        longest = max((e.end_time - e.start_time for e in events), default=timedelta(0))
+        
+        conflicts = []
+        for time in times:
+            lo = bisect_right(starts, time - longest)
+            hi = bisect_left(starts, time + duration)
+            overlapping = [e for e in events[lo:hi] if e.end_time > time]
+            if overlapping:
+                conflicts.append(self._event_to_dict(max(overlapping, key=lambda e: e.importance)))
+            else:
+                conflicts.append(None)
+        return conflicts
+    
+    def _events_overlapping(self, start: datetime, end: datetime) -> list[CalendarEventDB]:
+        """Events overlapping [start, end) sorted by start, from the preload when it covers the range."""
+        if self._window and self._window[0] <= start and end <= self._window[1]:
+            return [e for e in self._window_events if e.start_time < end and e.end_time > start]
+        
+        return self.db.query(CalendarEventDB).filter(
+            CalendarEventDB.user_id == self.user_id,
+            CalendarEventDB.start_time < end,
+            CalendarEventDB.end_time > start
+        ).order_by(CalendarEventDB.start_time).all()
+    
+    def _event_to_dict(self, e: CalendarEventDB) -> dict:
+        """Serialize a calendar event for the LLM / API."""
+        return {
+            "id": e.id,
+            "title": e.title,
+            "start_time": e.start_time.isoformat(),
+            "end_time": e.end_time.isoformat(),
+            "event_type": e.event_type,
+            "external": e.external,
+            "importance": e.importance,
+            "recurring": e.recurring
+        }
+    
+    def _decision_to_dict(self, d: DecisionHistoryDB) -> dict:
+        """Serialize a past decision for the LLM / API."""
+        return {
+            "id": d.id,
+            "meeting_type": d.meeting_type,
+            "conflicting_type": d.conflicting_type,
+            "recommended_action": d.recommended_action,
+            "user_action": d.user_action,
+            "notes": d.notes
+        }
+    
     def calculate_utilities(
         self,
         meeting_request: dict,
         hash_to_time: dict[str, str],
-        duration_minutes: int
+        duration_minutes: int,
+        time_to_hash: Optional[dict[str, str]] = None,
+        hash_to_datetime: Optional[dict[str, datetime]] = None
     ) -> UtilityResponse:
         """
         Calculate utility scores for each time slot.
         
         This is where the LLM magic happens - privately, on the user's side.
+        `time_to_hash` (reverse mapping) and `hash_to_datetime` (parsed times)
+        are optional; pass them when the caller already has them (the Meeting
+        Agent builds both once per meeting).
         """
-        # Build slot details with conflict info
+        # Build slot details with conflict info (one calendar query for all slots)
+        if hash_to_datetime is not None:
+            times = [hash_to_datetime[hash_val] for hash_val in hash_to_time]
+        else:
+            times = [datetime.fromisoformat(time_str) for time_str in hash_to_time.values()]
+        conflicts = self.get_conflicts_for_slots(times, duration_minutes)
+        
         slots = []
-        for hash_val, time_str in hash_to_time.items():
-            time = datetime.fromisoformat(time_str)
-            conflict = self.get_conflict_at(time, duration_minutes)
-            
+        for (hash_val, time_str), conflict in zip(hash_to_time.items(), conflicts):
             slots.append({
                 "hash": hash_val,
                 "time": time_str,
@@ -132,30 +292,40 @@ class UserProxyAgent:
 
         # Normalize utilities keys: model may return time strings instead of hashes
         utilities = result.get("utilities", {})
+        slot_breakdown = result.get("slot_breakdown", [])
+        first_slot = slot_breakdown[0] if slot_breakdown else {}
+        
+        # Common case: keys are already hashes (and slots carry their time);
+        # checking the first entry is enough to skip the per-key rewrite
+        utilities_ok = not utilities or next(iter(utilities)) in hash_to_time
+        breakdown_ok = not slot_breakdown or (
+            first_slot.get("slot_id") in hash_to_time and "time" in first_slot
+        )
+        
         # hash_to_time is mapping hash->time (ISO string)
-        time_to_hash = {v: k for k, v in hash_to_time.items()}
-        normalized_utils: dict[str, int] = {}
-        for key, score in utilities.items():
-            # If key already a hash we expect
-            if key in hash_to_time:
-                normalized_utils[key] = score
-            # If key is a time string, map to hash
-            elif key in time_to_hash:
-                normalized_utils[time_to_hash[key]] = score
-            else:
-                # Unknown key format - keep as-is
-                normalized_utils[key] = score
+        if time_to_hash is None and not (utilities_ok and breakdown_ok):
+            time_to_hash = {v: k for k, v in hash_to_time.items()}
+        
+        if utilities_ok:
+            normalized_utils: dict[str, int] = utilities
+        else:
+            # Hash keys stay as-is, time string keys map to their hash,
+            # unknown key formats are kept unchanged
+            normalized_utils = {
+                key if key in hash_to_time else time_to_hash.get(key, key): score
+                for key, score in utilities.items()
+            }
 
         # Normalize slot_breakdown slot_id values similarly
-        slot_breakdown = result.get("slot_breakdown", [])
-        for slot in slot_breakdown:
-            sid = slot.get("slot_id")
-            # if slot_id is a time string, convert to hash
-            if isinstance(sid, str) and sid in time_to_hash:
-                slot["slot_id"] = time_to_hash[sid]
-            # ensure a human-readable time field exists
-            if "time" not in slot and slot.get("slot_id") in hash_to_time:
-                slot["time"] = hash_to_time[slot["slot_id"]]
+        if not breakdown_ok:
+            for slot in slot_breakdown:
+                sid = slot.get("slot_id")
+                # if slot_id is a time string, convert to hash
+                if isinstance(sid, str) and sid in time_to_hash:
+                    slot["slot_id"] = time_to_hash[sid]
+                # ensure a human-readable time field exists
+                if "time" not in slot and slot.get("slot_id") in hash_to_time:
+                    slot["time"] = hash_to_time[slot["slot_id"]]
 
         escalate, reason = self._should_escalate(normalized_utils)
 
@@ -171,22 +341,22 @@ class UserProxyAgent:
     
     def _should_escalate(self, utilities: dict[str, int]) -> tuple[bool, Optional[str]]:
         """Determine if we should escalate to the user."""
-        scores = list(utilities.values())
+        # Only the top two scores matter - no need to sort them all
+        top_scores = heapq.nlargest(2, utilities.values())
         
-        if not scores:
+        if not top_scores:
             return True, "No available slots"
         
-        max_score = max(scores)
+        max_score = top_scores[0]
         
         # No good options
         if max_score < 40:
             return True, f"All slots have low scores (max: {max_score})"
         
         # Too close to call - top 2 within 10 points
-        sorted_scores = sorted(scores, reverse=True)
-        if len(sorted_scores) >= 2:
-            if sorted_scores[0] - sorted_scores[1] < 10:
-                return True, f"Multiple similar options (scores: {sorted_scores[0]}, {sorted_scores[1]})"
+        if len(top_scores) >= 2:
+            if top_scores[0] - top_scores[1] < 10:
+                return True, f"Multiple similar options (scores: {top_scores[0]}, {top_scores[1]})"
         
         return False, None
     
@@ -199,10 +369,8 @@ class UserProxyAgent:
         notes: Optional[str] = None
     ) -> None:
         """Record a scheduling decision for future learning."""
-        import uuid
-        
         decision = DecisionHistoryDB(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             user_id=self.user_id,
             timestamp=datetime.utcnow(),
             meeting_type=meeting_type,
@@ -213,6 +381,11 @@ class UserProxyAgent:
         )
         self.db.add(decision)
         self.db.commit()
+        
+        # History changed - drop memoized reads
+        self._decision_cache.clear()
+        self._prefs_cache = None
+        self._recent_history = None
 
     def get_learned_preferences(self) -> dict:
         """
@@ -223,6 +396,9 @@ class UserProxyAgent:
         - reschedule_ok: event types the user is willing to move
         - preferred_times: morning, afternoon, etc.
         """
+        if self._prefs_cache is not None:
+            return self._prefs_cache
+        
         decisions = self.get_decision_history(limit=50)
         
         protect_events = set()
@@ -258,8 +434,9 @@ class UserProxyAgent:
         
         defaults = user_prefs.get(self.user_id, {})
         
-        return {
+        self._prefs_cache = {
             "protect_events": list(protect_events) or defaults.get("protect_events", []),
             "reschedule_ok": list(reschedule_ok) or defaults.get("reschedule_ok", []),
             "preferred_times": defaults.get("preferred_times", [])
         }
+        return self._prefs_cache
@@ -11,13 +11,48 @@ class Config:
     # LLM Mode: "mock" or "openai"
     LLM_MODE: str = os.getenv("LLM_MODE", "mock")
     
+    # Stream OpenAI completions instead of waiting for the whole body
+    LLM_STREAM: bool = os.getenv("LLM_STREAM", "false").lower() == "true"
+    
+    # Coalesce concurrent OpenAI utility calls into one multi-request completion
+    LLM_DYNAMIC_BATCHING: bool = os.getenv("LLM_DYNAMIC_BATCHING", "false").lower() == "true"
+    LLM_MAX_BATCH_SIZE: int = int(os.getenv("LLM_MAX_BATCH_SIZE", "32"))
+    LLM_BATCH_WAIT_S: float = float(os.getenv("LLM_BATCH_WAIT_S", "0.002"))
+    
+    # Route offline bulk scoring (calculate_utilities_batch) through the OpenAI Batch API
+    LLM_BATCH_MODE: bool = os.getenv("LLM_BATCH_MODE", "false").lower() == "true"
+    LLM_BATCH_POLL_S: float = float(os.getenv("LLM_BATCH_POLL_S", "30"))
+    
     # Database - Railway uses postgres:// but SQLAlchemy needs postgresql://
     _db_url: str = os.getenv("DATABASE_URL", "sqlite:///./meeting_safe.db")
     DATABASE_URL: str = _db_url.replace("postgres://", "postgresql://") if _db_url.startswith("postgres://") else _db_url
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "16"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "32"))
+    
+    # How long calendar/demo payloads stay cached per user (writes clear them sooner)
+    RESPONSE_CACHE_TTL_S: float = float(os.getenv("RESPONSE_CACHE_TTL_S", "900"))
+    
+    # Seed sample data on startup when the database is empty (single-worker demos;
+    # otherwise run `python seed.py` once before starting the server)
+    AUTO_SEED: bool = os.getenv("AUTO_SEED", "false").lower() == "true"
+    
+    # Threads shared by all meetings for running participant agents concurrently
+    AGENT_WORKERS: int = int(os.getenv("AGENT_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+    
+    # Largest scheduling window, in candidate slots (672 = two weeks of half hours)
+    MAX_MEETING_SLOTS: int = int(os.getenv("MAX_MEETING_SLOTS", "672"))
+    # Identical schedule requests within this many seconds reuse the first result
+    SCHEDULE_MEMO_TTL_S: float = float(os.getenv("SCHEDULE_MEMO_TTL_S", "60"))
+    
+    # Threads running background scheduling jobs (POST /api/meetings/schedule/async)
+    SCHEDULE_WORKERS: int = int(os.getenv("SCHEDULE_WORKERS", "4"))
     
     # Server
     HOST: str = os.getenv("HOST", "127.0.0.1")
     PORT: int = int(os.getenv("PORT", "8000"))
+    # Worker processes. Response caches and background task status live in
+    # each process, so with more than one, task polling needs sticky routing.
+    WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))
 
 
 config = Config()
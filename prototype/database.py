@@ -1,16 +1,72 @@
-from sqlalchemy import create_engine, Column, String, DateTime, Boolean, Integer, Text, ForeignKey
+from sqlalchemy import create_engine, event, text, Column, String, DateTime, Boolean, Integer, Text, ForeignKey, Index
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import StaticPool
 from datetime import datetime
 
 from config import config
 
-# SQLite needs check_same_thread=False, PostgreSQL doesn't
-if config.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(config.DATABASE_URL, connect_args={"check_same_thread": False})
+database_url = make_url(config.DATABASE_URL)
+
+# Async driver per supported backend (see async_engine below)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+if database_url.get_backend_name() not in ASYNC_DRIVERS:
+    raise ValueError(
+        f"Unsupported database backend {database_url.get_backend_name()!r} in DATABASE_URL "
+        f"(supported: {', '.join(ASYNC_DRIVERS)})"
+    )
+
+is_sqlite = database_url.get_backend_name() == "sqlite"
+# An in-memory SQLite database exists only inside its connection
+is_memory_sqlite = is_sqlite and database_url.database in (None, "", ":memory:")
+
+if is_memory_sqlite:
+    # A plain in-memory database is private to one connection, and the sync
+    # and async engines each hold their own. Name it and open it with a
+    # shared cache so both see the same database; each engine keeps a single
+    # connection (StaticPool), which also keeps the database alive.
+    database_url = database_url.set(
+        database="file:meeting_safe",
+        query={"mode": "memory", "cache": "shared", "uri": "true"}
+    )
+    pool_options = {"poolclass": StaticPool}
 else:
-    engine = create_engine(config.DATABASE_URL)
+    # Pool is sized for one session per participant in a concurrent coordination.
+    pool_options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True
+    }
+
+# SQLite needs check_same_thread=False, PostgreSQL doesn't.
+engine = create_engine(
+    database_url,
+    connect_args={"check_same_thread": False} if is_sqlite else {},
+    **pool_options
+)
+
+# Same database through async drivers (aiosqlite / asyncpg) for the API
+# endpoints, so their queries don't each hold a threadpool worker. The driver
+# is swapped whatever the URL named (e.g. postgresql+psycopg2://).
+async_database_url = database_url.set(drivername=ASYNC_DRIVERS[database_url.get_backend_name()])
+
+async_engine = create_async_engine(async_database_url, **pool_options)
+
+if is_sqlite:
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run alongside a writer; mmap serves reads from mapped pages
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -39,6 +95,13 @@ class CalendarEventDB(Base):
     recurring = Column(Boolean, default=False)
     
     user = relationship("UserDB", back_populates="events")
+    
+    # Conflict/calendar lookups filter by user + time range: seek on
+    # (user_id, start_time) and check end_time from the same index entry
+    __table_args__ = (
+        Index("ix_events_user_time", "user_id", "start_time", "end_time"),
+        Index("ix_events_user_end", "user_id", "end_time"),
+    )
 
 
 class DecisionHistoryDB(Base):
@@ -54,6 +117,11 @@ class DecisionHistoryDB(Base):
     notes = Column(Text, nullable=True)
     
     user = relationship("UserDB", back_populates="decisions")
+    
+    # get_decision_history: WHERE user_id = ? ORDER BY timestamp DESC LIMIT n
+    __table_args__ = (
+        Index("ix_decisions_user_timestamp", "user_id", "timestamp"),
+    )
 
 
 class MeetingDB(Base):
@@ -67,8 +135,19 @@ class MeetingDB(Base):
     status = Column(String, default="pending")
 
 
+# Indexes replaced by wider ones, dropped from databases that still have them
+OBSOLETE_INDEXES = ["ix_events_user_start"]
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add any missing indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
 
 
 def get_db():
@@ -77,3 +156,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -7,29 +7,29 @@ Supports two modes:
 
 Key Feature: Rich explainability showing HOW preferences affect decisions.
 """
-from datetime import datetime
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from string import Formatter
+from typing import Optional, Sequence
 import json
 import hashlib
+import threading
+import time
+
+try:
+    from orjson import loads as json_loads  # C parser, same dict/list/str output
+except ImportError:
+    json_loads = json.loads
 
 from config import config
-from models import CalendarEvent, MeetingRequest, SchedulingDecision
+from models import CalendarEvent, MeetingRequest
 
 
-UTILITY_PROMPT_TEMPLATE = """You are a scheduling assistant for {user_name}.
-
-NEW MEETING REQUEST:
-- Title: {title}
-- Organizer: {organizer}
-- Type: {meeting_type}
-- External: {external}
-- Duration: {duration} minutes
-
-YOUR CALENDAR FOR EACH TIME SLOT:
-{slot_details}
-
-LEARNED PREFERENCES FROM PAST DECISIONS:
-{preferences}
+# Static rubric sent verbatim as the system message on every call, so the
+# provider can cache it as a shared prompt prefix. Keep anything per-user or
+# per-meeting out of it.
+SYSTEM_RUBRIC = """You are a scheduling assistant acting privately on behalf of one user.
 
 INSTRUCTIONS:
 For each time slot, output a utility score 0-100.
@@ -46,49 +46,274 @@ Consider:
 - Never reschedule external/customer meetings
 
 Output JSON only:
-{{
-  "utilities": {{"slot_id": score, ...}},
+{
+  "utilities": {"slot_id": score, ...},
   "reasoning": "brief explanation of key decisions",
   "slot_breakdown": [
-    {{
+    {
       "slot_id": "hash",
       "score": 65,
       "decision": "WILLING_TO_RESCHEDULE or PROTECT or FREE",
       "factors": ["factor1", "factor2"]
-    }}
+    }
   ]
-}}"""""
+}"""
+
+
+# Dynamic per-call content, ordered most-stable first (user, learned
+# preferences) and most-volatile last (the slot list)
+USER_TEMPLATE = """You are scheduling for {user_name}.
+
+LEARNED PREFERENCES FROM PAST DECISIONS:
+{preferences}
+
+NEW MEETING REQUEST:
+- Title: {title}
+- Organizer: {organizer}
+- Type: {meeting_type}
+- External: {external}
+- Duration: {duration} minutes
+
+YOUR CALENDAR FOR EACH TIME SLOT:
+{slot_details}"""
+
+
+def compile_template(template: str) -> tuple[tuple[str, Optional[str]], ...]:
+    """
+    Split a str.format template into (literal text, field name) pairs, once.
+    
+    Only plain {field} placeholders are supported - no format specs or
+    conversions - so rendering is a straight join (see render_template).
+    """
+    compiled = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Template field {field!r} uses a format spec or conversion")
+        compiled.append((literal, field))
+    return tuple(compiled)
+
+
+def render_template(compiled: tuple[tuple[str, Optional[str]], ...], **values) -> str:
+    """Fill a compiled template; same text as template.format(**values)."""
+    parts = []
+    append = parts.append
+    for literal, field in compiled:
+        append(literal)
+        if field is not None:
+            append(str(values[field]))
+    return "".join(parts)
+
+
+USER_PROMPT = compile_template(USER_TEMPLATE)
+
+
+BATCH_PROMPT_HEADER = """Below are {count} independent scheduling requests, each for a different user.
+Answer every request using the instructions above, without mixing information between them.
+
+Output JSON only, one entry per request id:
+{{"<request_id>": <that request's JSON answer>, ...}}"""
+
+
+# Indexed by the event's `external` flag
+_EXTERNAL_LABEL = ("internal", "external")
 
 
 def build_slot_details(slots: list[dict]) -> str:
     """Format slot details for the prompt."""
     lines = []
+    append = lines.append
     for slot in slots:
         if slot["status"] == "free":
-            lines.append(f"- {slot['time']}: FREE")
+            append(f"- {slot['time']}: FREE")
         else:
             event = slot["conflict_event"]
-            lines.append(
+            append(
                 f"- {slot['time']}: CONFLICT - \"{event['title']}\" "
                 f"({event['event_type']}, importance {event['importance']}, "
-                f"{'external' if event['external'] else 'internal'})"
+                f"{_EXTERNAL_LABEL[bool(event['external'])]})"
             )
     return "\n".join(lines)
 
 
-def build_preferences(decisions: list[SchedulingDecision]) -> str:
-    """Extract preferences from decision history."""
-    if not decisions:
-        return "No past decisions recorded yet."
+# Decisions shown in a prompt. The agent passes its 10 most recent, so the
+# least relevant of those are left out.
+PROMPT_DECISIONS = 5
+
+
+def build_preferences(
+    decisions: list[dict],
+    slot_event_types: Optional[set[str]] = None,
+    k: int = PROMPT_DECISIONS
+) -> str:
+    """
+    Extract preferences from decision history (dicts as from UserProxyAgent).
     
-    lines = []
-    for d in decisions:
-        if d.user_action == "accepted":
-            lines.append(f"- You ACCEPTED rescheduling {d.conflicting_type} for {d.meeting_type}")
-        elif d.user_action == "rejected":
-            lines.append(f"- You REJECTED rescheduling {d.conflicting_type} for {d.meeting_type}")
+    Only the top `k` decisions relevant to `slot_event_types` are kept (see
+    select_relevant_decisions). They are reduced to a sorted (action,
+    conflicting type, meeting type) key, so the same preference set always
+    renders byte-identical text and is only formatted once per process.
+    """
+    decisions = select_relevant_decisions(decisions, slot_event_types, k)
+    key = tuple(sorted(
+        (d["user_action"], str(d.get("conflicting_type")), d["meeting_type"])
+        for d in decisions
+    ))
+    return _render_preferences(key)
+
+
+def select_relevant_decisions(
+    decisions: list[dict],
+    slot_event_types: Optional[set[str]],
+    k: int
+) -> list[dict]:
+    """
+    Top-k decisions for the event types actually in play.
+    
+    A decision about a conflicting type present in the slots ranks first, one
+    whose meeting type is present ranks next, the rest last. Ties keep the
+    incoming (newest-first) order.
+    """
+    if slot_event_types is None:
+        return decisions[:k]
+    
+    def relevance(d: dict) -> int:
+        if d.get("conflicting_type") in slot_event_types:
+            return 2
+        if d["meeting_type"] in slot_event_types:
+            return 1
+        return 0
+    
+    return sorted(decisions, key=relevance, reverse=True)[:k]
+
+
+@lru_cache(maxsize=1024)
+def _render_preferences(preferences_key: tuple[tuple[str, str, str], ...]) -> str:
+    if not preferences_key:
+        text = "No past decisions recorded yet."
+    else:
+        lines = []
+        for user_action, conflicting_type, meeting_type in preferences_key:
+            if user_action == "accepted":
+                lines.append(f"- You ACCEPTED rescheduling {conflicting_type} for {meeting_type}")
+            elif user_action == "rejected":
+                lines.append(f"- You REJECTED rescheduling {conflicting_type} for {meeting_type}")
+        text = "\n".join(lines) if lines else "No clear preferences learned yet."
+    return text
+
+
+def clock_label(hour: int, minute: int) -> str:
+    """Same text as strftime("%I:%M %p") without needing a datetime."""
+    return f"{hour % 12 or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+# Every label of the day, built once at import and indexed by
+# hour * 60 + minute, so scoring never formats a clock string per slot
+CLOCK_LABELS = tuple(clock_label(hour, minute) for hour in range(24) for minute in range(60))
+
+
+# Factor entries are flyweights: identical factors are one shared dict (and
+# free slots share one factors tuple) instead of fresh allocations per slot.
+# They are shared by every cached result, so callers only ever see copies
+# (MockLLM._copy_result).
+FACTOR_BASE_FREE = {"type": "base_free", "value": 80, "reason": "Slot is free"}
+FACTOR_MORNING = {"type": "time_preference", "value": +10, "reason": "Morning slot (9-11 AM) preferred"}
+FACTOR_LUNCH = {"type": "time_preference", "value": -10, "reason": "Lunch hour penalty"}
+
+FREE_FACTORS = {
+    "free": (FACTOR_BASE_FREE,),
+    "free_morning": (FACTOR_BASE_FREE, FACTOR_MORNING),
+    "free_lunch": (FACTOR_BASE_FREE, FACTOR_LUNCH),
+}
+
+
+@lru_cache(maxsize=1024)
+def conflict_factor(rule: str, detail) -> dict:
+    """
+    Shared factor entry for a conflict rule from score_slot.
     
-    return "\n".join(lines) if lines else "No clear preferences learned yet."
+    `detail` is what the reason mentions: the event title (external), the
+    event type (learned rules) or the importance (importance rules).
+    """
+    if rule == "external":
+        return {"type": "external_protection", "value": 0, "reason": f"NEVER reschedule external meeting: {detail}"}
+    if rule == "learned_protect":
+        return {"type": "learned_preference", "value": 5, "reason": f"🧠 LEARNED: User previously REJECTED rescheduling {detail}"}
+    if rule == "learned_reschedule":
+        return {"type": "learned_preference", "value": 65, "reason": f"🧠 LEARNED: User previously ACCEPTED rescheduling {detail}"}
+    if rule == "low_importance":
+        return {"type": "importance_score", "value": 60, "reason": f"Low importance ({detail}/10) - willing to reschedule"}
+    if rule == "medium_importance":
+        return {"type": "importance_score", "value": 30, "reason": f"Medium importance ({detail}/10) - reluctant to reschedule"}
+    return {"type": "importance_score", "value": 10, "reason": f"High importance ({detail}/10) - strongly protect"}
+
+
+def make_breakdown(
+    slot_id: str,
+    time_str: str,
+    score: int,
+    status: str,
+    conflict: Optional[dict],
+    factors: Sequence[dict],
+    decision: str,
+    decision_reason: str,
+    base_score: int = 0
+) -> dict:
+    """One slot_breakdown entry - the single place its shape is defined."""
+    return {
+        "slot_id": slot_id,
+        "time": time_str,
+        "score": score,
+        "base_score": base_score,
+        "status": status,
+        "conflict": conflict,
+        "factors": factors,
+        "decision": decision,
+        "decision_reason": decision_reason
+    }
+
+
+# Only the first few notable slots are summarized in the reasoning text
+MAX_REASONING_PARTS = 5
+
+
+# Free-slot (score, rule) for each hour of the day: base 80, morning
+# (9-11) +10, lunch (12-13) -10. One index instead of range checks per slot.
+FREE_SCORE_BY_HOUR = tuple(
+    (90, "free_morning") if 9 <= hour <= 11
+    else (70, "free_lunch") if 12 <= hour <= 13
+    else (80, "free")
+    for hour in range(24)
+)
+
+
+def score_slot(
+    is_free: bool,
+    hour: int,
+    importance: int,
+    is_external: bool,
+    learned: Optional[str]
+) -> tuple[int, str]:
+    """
+    Numeric core of the mock scoring: (score, rule) for one slot.
+    
+    Takes only flat per-slot values and builds nothing, so the policy lives in
+    one place and MockLLM just attaches the explanation for the rule that fired.
+    `learned` is "protect", "reschedule" or None for the conflicting event type.
+    """
+    if is_free:
+        return FREE_SCORE_BY_HOUR[hour]
+    
+    if is_external:
+        return 0, "external"
+    if learned == "protect":
+        return 5, "learned_protect"
+    if learned == "reschedule":
+        return 65, "learned_reschedule"
+    if importance <= 4:
+        return 60, "low_importance"
+    if importance <= 7:
+        return 30, "medium_importance"
+    return 10, "high_importance"
 
 
 class MockLLM:
@@ -96,8 +321,16 @@ class MockLLM:
     Deterministic mock LLM for testing.
     
     Provides RICH EXPLAINABILITY showing exactly how preferences affect scoring.
+    Scoring is deterministic, so results are memoized by a fingerprint of
+    everything they depend on (bounded LRU, shared by all threads).
     """
     
+    cache_size = 1024
+    
+    def __init__(self):
+        self._cache: OrderedDict[bytes, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
     def calculate_utilities(
         self,
         user_id: str,
@@ -121,66 +354,55 @@ class MockLLM:
         
         Returns rich breakdown showing WHY each score was assigned.
         """
+        key = self._fingerprint(slots, decisions)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            return self._copy_result(cached, [slot["hash"] for slot in slots])
+        
         utilities = {}
         reasoning_parts = []
         slot_breakdown = []
         preferences_applied = []
         
-        # Build preference modifiers from history
-        protect_types = {}  # type -> decision that caused it
-        reschedule_types = {}  # type -> decision that caused it
+        # Build preference modifiers from history: event type -> learned rule,
+        # resolved once so each slot is a single lookup (protect wins)
+        learned_rules: dict[str, str] = {}
         for d in decisions:
-            if d.get("user_action") == "rejected" and d.get("conflicting_type"):
-                protect_types[d["conflicting_type"]] = d
-            elif d.get("user_action") == "accepted" and d.get("conflicting_type"):
-                reschedule_types[d["conflicting_type"]] = d
+            conflicting_type = d.get("conflicting_type")
+            if not conflicting_type:
+                continue
+            if d.get("user_action") == "rejected":
+                learned_rules[conflicting_type] = "protect"
+            elif d.get("user_action") == "accepted":
+                learned_rules.setdefault(conflicting_type, "reschedule")
+        
+        # Read every slot's hour/minute in one pass, straight from the ISO text
+        # ("YYYY-MM-DDTHH:MM...") - no datetime object per slot
+        clocks = [
+            (int(t[11:13]), int(t[14:16])) if isinstance(t, str) else (t.hour, t.minute)
+            for t in (slot["time"] for slot in slots)
+        ]
         
-        for slot in slots:
+        for slot, (hour, minute) in zip(slots, clocks):
             slot_id = slot["hash"]
-            time_obj = datetime.fromisoformat(slot["time"]) if isinstance(slot["time"], str) else slot["time"]
-            hour = time_obj.hour
-            time_str = time_obj.strftime("%I:%M %p")
-            
-            factors = []
+            time_str = CLOCK_LABELS[hour * 60 + minute]
             
             if slot["status"] == "free":
-                # Base score for free slot
-                base_score = 80
-                score = base_score
-                factors.append({
-                    "type": "base_free",
-                    "value": 80,
-                    "reason": "Slot is free"
-                })
+                score, rule = score_slot(True, hour, 0, False, None)
                 
-                # Time of day preference
-                if 9 <= hour <= 11:
-                    score += 10
-                    factors.append({
-                        "type": "time_preference",
-                        "value": +10,
-                        "reason": "Morning slot (9-11 AM) preferred"
-                    })
-                    reasoning_parts.append(f"Morning slot {time_str} gets bonus")
-                elif 12 <= hour <= 13:
-                    score -= 10
-                    factors.append({
-                        "type": "time_preference", 
-                        "value": -10,
-                        "reason": "Lunch hour penalty"
-                    })
+                # Base + time of day preference (shared flyweight list)
+                factors = FREE_FACTORS[rule]
+                if rule == "free_morning":
+                    if len(reasoning_parts) < MAX_REASONING_PARTS:
+                        reasoning_parts.append(f"Morning slot {time_str} gets bonus")
                 
-                slot_breakdown.append({
-                    "slot_id": slot_id,
-                    "time": time_str,
-                    "score": score,
-                    "base_score": base_score,
-                    "status": "FREE",
-                    "conflict": None,
-                    "factors": factors,
-                    "decision": "AVAILABLE",
-                    "decision_reason": f"No conflicts at {time_str}"
-                })
+                slot_breakdown.append(make_breakdown(
+                    slot_id, time_str, score, "FREE", None, factors,
+                    "AVAILABLE", f"No conflicts at {time_str}", base_score=80
+                ))
                 
             else:
                 # Conflict - evaluate if willing to reschedule
@@ -189,6 +411,10 @@ class MockLLM:
                 importance = event.get("importance", 5)
                 is_external = event.get("external", False)
                 
+                # Learned preferences are checked FIRST
+                learned = learned_rules.get(event_type)
+                score, rule = score_slot(False, hour, importance, is_external, learned)
+                
                 conflict_info = {
                     "title": event.get("title", "Unknown"),
                     "event_type": event_type,
@@ -196,135 +422,126 @@ class MockLLM:
                     "external": is_external
                 }
                 
-                # Never reschedule external meetings
-                if is_external:
-                    score = 0
-                    factors.append({
-                        "type": "external_protection",
-                        "value": 0,
-                        "reason": f"NEVER reschedule external meeting: {event.get('title')}"
+                if rule == "external":
+                    # Never reschedule external meetings
+                    factor = conflict_factor(rule, event.get("title"))
+                    if len(reasoning_parts) < MAX_REASONING_PARTS:
+                        reasoning_parts.append(f"Protecting external meeting at {time_str}")
+                    decision = "PROTECT"
+                    decision_reason = "External/customer meetings are never rescheduled"
+                elif rule == "learned_protect":
+                    factor = conflict_factor(rule, event_type)
+                    if len(reasoning_parts) < MAX_REASONING_PARTS:
+                        reasoning_parts.append(f"Learned: protect {event_type}")
+                    preferences_applied.append({
+                        "preference": f"protect_{event_type}",
+                        "effect": "Score reduced to 5",
+                        "source": f"User rejected rescheduling {event_type}"
                     })
-                    reasoning_parts.append(f"Protecting external meeting at {time_str}")
-                    
-                    slot_breakdown.append({
-                        "slot_id": slot_id,
-                        "time": time_str,
-                        "score": 0,
-                        "base_score": 0,
-                        "status": "CONFLICT",
-                        "conflict": conflict_info,
-                        "factors": factors,
-                        "decision": "PROTECT",
-                        "decision_reason": "External/customer meetings are never rescheduled"
+                    decision = "PROTECT"
+                    decision_reason = f"Learned preference: user protects {event_type} meetings"
+                elif rule == "learned_reschedule":
+                    factor = conflict_factor(rule, event_type)
+                    if len(reasoning_parts) < MAX_REASONING_PARTS:
+                        reasoning_parts.append(f"Learned: willing to reschedule {event_type}")
+                    preferences_applied.append({
+                        "preference": f"reschedule_{event_type}",
+                        "effect": "Score boosted to 65",
+                        "source": f"User accepted rescheduling {event_type}"
                     })
+                    decision = "WILLING_TO_RESCHEDULE"
+                    decision_reason = f"Learned preference: user accepts rescheduling {event_type}"
+                # Default importance-based scoring
+                elif rule == "low_importance":
+                    factor = conflict_factor(rule, importance)
+                    decision = "WILLING_TO_RESCHEDULE"
+                    decision_reason = f"Low importance meeting ({importance}/10)"
+                elif rule == "medium_importance":
+                    factor = conflict_factor(rule, importance)
+                    decision = "RELUCTANT"
+                    decision_reason = f"Medium importance meeting ({importance}/10)"
                 else:
-                    # Check learned preferences FIRST
-                    if event_type in protect_types:
-                        score = 5
-                        source_decision = protect_types[event_type]
-                        factors.append({
-                            "type": "learned_preference",
-                            "value": 5,
-                            "reason": f"🧠 LEARNED: User previously REJECTED rescheduling {event_type}"
-                        })
-                        reasoning_parts.append(f"Learned: protect {event_type}")
-                        preferences_applied.append({
-                            "preference": f"protect_{event_type}",
-                            "effect": "Score reduced to 5",
-                            "source": f"User rejected rescheduling {event_type}"
-                        })
-                        
-                        slot_breakdown.append({
-                            "slot_id": slot_id,
-                            "time": time_str,
-                            "score": score,
-                            "base_score": 0,
-                            "status": "CONFLICT",
-                            "conflict": conflict_info,
-                            "factors": factors,
-                            "decision": "PROTECT",
-                            "decision_reason": f"Learned preference: user protects {event_type} meetings"
-                        })
-                        
-                    elif event_type in reschedule_types:
-                        score = 65
-                        source_decision = reschedule_types[event_type]
-                        factors.append({
-                            "type": "learned_preference",
-                            "value": 65,
-                            "reason": f"🧠 LEARNED: User previously ACCEPTED rescheduling {event_type}"
-                        })
-                        reasoning_parts.append(f"Learned: willing to reschedule {event_type}")
-                        preferences_applied.append({
-                            "preference": f"reschedule_{event_type}",
-                            "effect": "Score boosted to 65",
-                            "source": f"User accepted rescheduling {event_type}"
-                        })
-                        
-                        slot_breakdown.append({
-                            "slot_id": slot_id,
-                            "time": time_str,
-                            "score": score,
-                            "base_score": 0,
-                            "status": "CONFLICT",
-                            "conflict": conflict_info,
-                            "factors": factors,
-                            "decision": "WILLING_TO_RESCHEDULE",
-                            "decision_reason": f"Learned preference: user accepts rescheduling {event_type}"
-                        })
-                    else:
-                        # Default importance-based scoring
-                        if importance <= 4:
-                            score = 60
-                            factors.append({
-                                "type": "importance_score",
-                                "value": 60,
-                                "reason": f"Low importance ({importance}/10) - willing to reschedule"
-                            })
-                            decision = "WILLING_TO_RESCHEDULE"
-                            decision_reason = f"Low importance meeting ({importance}/10)"
-                        elif importance <= 7:
-                            score = 30
-                            factors.append({
-                                "type": "importance_score",
-                                "value": 30,
-                                "reason": f"Medium importance ({importance}/10) - reluctant to reschedule"
-                            })
-                            decision = "RELUCTANT"
-                            decision_reason = f"Medium importance meeting ({importance}/10)"
-                        else:
-                            score = 10
-                            factors.append({
-                                "type": "importance_score",
-                                "value": 10,
-                                "reason": f"High importance ({importance}/10) - strongly protect"
-                            })
-                            reasoning_parts.append(f"High importance meeting at {time_str}")
-                            decision = "PROTECT"
-                            decision_reason = f"High importance meeting ({importance}/10)"
-                            
-                        slot_breakdown.append({
-                            "slot_id": slot_id,
-                            "time": time_str,
-                            "score": score,
-                            "base_score": 0,
-                            "status": "CONFLICT",
-                            "conflict": conflict_info,
-                            "factors": factors,
-                            "decision": decision,
-                            "decision_reason": decision_reason
-                        })
+                    factor = conflict_factor(rule, importance)
+                    if len(reasoning_parts) < MAX_REASONING_PARTS:
+                        reasoning_parts.append(f"High importance meeting at {time_str}")
+                    decision = "PROTECT"
+                    decision_reason = f"High importance meeting ({importance}/10)"
+                
+                slot_breakdown.append(make_breakdown(
+                    slot_id, time_str, score, "CONFLICT", conflict_info, (factor,),
+                    decision, decision_reason
+                ))
             
             utilities[slot_id] = score
         
-        reasoning = "; ".join(reasoning_parts[:5]) if reasoning_parts else "Standard availability scoring"
+        reasoning = "; ".join(reasoning_parts) if reasoning_parts else "Standard availability scoring"
         
-        return {
+        result = {
             "utilities": utilities,
             "reasoning": reasoning,
             "slot_breakdown": slot_breakdown,
             "preferences_applied": preferences_applied
         }
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return self._copy_result(result, list(utilities))
+    
+    @staticmethod
+    def _fingerprint(slots: list[dict], decisions: list[dict]) -> bytes:
+        """
+        Digest of every input the scoring reads: each slot's time, status and
+        conflicting event, plus the decisions' (type, action) pairs.
+        
+        Keyed on content rather than ids, so an edited calendar or a new
+        decision never hits a stale entry. Slot hashes are left out: they are
+        salted per meeting, so the same calendar scored for a new meeting
+        would never hit. The caller's hashes are put back by _copy_result.
+        """
+        slot_key = tuple(
+            (slot["time"],) if slot["status"] == "free"
+            else (
+                slot["time"], event.get("title"), event.get("event_type"),
+                event.get("importance"), event.get("external")
+            )
+            for slot in slots
+            for event in (slot["conflict_event"] or {},)
+        )
+        decision_key = tuple(
+            (d.get("conflicting_type"), d.get("user_action")) for d in decisions
+        )
+        return hashlib.blake2b(repr((slot_key, decision_key)).encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _copy_result(result: dict, slot_ids: list[str]) -> dict:
+        """
+        A deep copy of a cached result under the caller's slot ids, so callers
+        can't corrupt the cache or the shared factor entries.
+        
+        Copies exactly the nesting a result has (every leaf is a str, int,
+        float, bool or None), which is much cheaper than copy.deepcopy.
+        """
+        slot_breakdown = [
+            {
+                **b,
+                "slot_id": slot_id,
+                "conflict": dict(b["conflict"]) if b["conflict"] is not None else None,
+                "factors": [dict(f) for f in b["factors"]]
+            }
+            for slot_id, b in zip(slot_ids, result["slot_breakdown"])
+        ]
+        return {
+            # One utility per slot, equal to its breakdown score
+            "utilities": {b["slot_id"]: b["score"] for b in slot_breakdown},
+            "reasoning": result["reasoning"],
+            "slot_breakdown": slot_breakdown,
+            "preferences_applied": [dict(p) for p in result["preferences_applied"]]
+        }
+    
+    def calculate_utilities_batch(self, requests: list[dict]) -> list[dict]:
+        """Score many requests (each holds calculate_utilities kwargs), in order."""
+        return [self.calculate_utilities(**r) for r in requests]
 
 
 class OpenAILLM:
@@ -337,6 +554,13 @@ class OpenAILLM:
         from openai import OpenAI
         self.client = OpenAI(api_key=config.OPENAI_API_KEY)
         self.model = config.OPENAI_MODEL
+        self.stream = config.LLM_STREAM
+        
+        # Optionally coalesce concurrent participants' prompts into one call
+        self.batcher = (
+            UtilityBatcher(self, config.LLM_MAX_BATCH_SIZE, config.LLM_BATCH_WAIT_S)
+            if config.LLM_DYNAMIC_BATCHING else None
+        )
     
     def calculate_utilities(
         self,
@@ -347,15 +571,91 @@ class OpenAILLM:
         decisions: list[dict]
     ) -> dict:
         """Call OpenAI to calculate utilities with rich reasoning."""
+        prompt = self._build_prompt(user_name, meeting_request, slots, decisions)
+        
+        if self.batcher:
+            result = self.batcher.submit(prompt)
+        else:
+            result = self._complete(prompt)
+        
+        return self._with_defaults(result)
+    
+    def calculate_utilities_batch(self, requests: list[dict]) -> list[dict]:
+        """
+        Score many requests (each holds calculate_utilities kwargs), in order.
         
+        For offline jobs such as nightly re-scoring. With LLM_BATCH_MODE on this
+        goes through the OpenAI Batch API - one JSONL upload instead of N
+        round-trips, cheaper and outside the online rate limits, but it can take
+        up to the 24h completion window. Otherwise each request is scored online.
+        """
+        if not config.LLM_BATCH_MODE:
+            return [self.calculate_utilities(**r) for r in requests]
+        
+        lines = [
+            json.dumps({
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._request_body(self._build_prompt(
+                    r["user_name"], r["meeting_request"], r["slots"], r["decisions"]
+                ))
+            })
+            for i, r in enumerate(requests)
+        ]
+        batch_input = self.client.files.create(
+            file=("utilities.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(config.LLM_BATCH_POLL_S)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        
+        # Demultiplex by custom_id; failed items land in the error file, not here
+        answers = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                item = json_loads(line)
+                body = (item.get("response") or {}).get("body") or {}
+                if body.get("choices"):
+                    answers[item["custom_id"]] = json_loads(body["choices"][0]["message"]["content"])
+        
+        # Anything the batch couldn't answer is retried online
+        return [
+            self._with_defaults(answers[f"req-{i}"]) if f"req-{i}" in answers
+            else self.calculate_utilities(**r)
+            for i, r in enumerate(requests)
+        ]
+    
+    def _build_prompt(
+        self,
+        user_name: str,
+        meeting_request: dict,
+        slots: list[dict],
+        decisions: list[dict]
+    ) -> str:
+        """Render the per-user part of the prompt (the rubric is the system message)."""
         # Build slot details
         slot_details = build_slot_details(slots)
         
-        # Build preferences from history
-        preferences = build_preferences([SchedulingDecision(**d) for d in decisions])
+        # Build preferences from the history relevant to the conflicts in play
+        slot_event_types = {
+            slot["conflict_event"]["event_type"]
+            for slot in slots if slot["status"] == "conflict"
+        }
+        preferences = build_preferences(decisions, slot_event_types)
         
-        # Build prompt
-        prompt = UTILITY_PROMPT_TEMPLATE.format(
+        return render_template(
+            USER_PROMPT,
             user_name=user_name,
             title=meeting_request["title"],
             organizer=meeting_request["organizer_id"],
@@ -365,31 +665,142 @@ class OpenAILLM:
             slot_details=slot_details,
             preferences=preferences
         )
-        
-        # Call OpenAI
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a scheduling assistant. Output only valid JSON with utilities, reasoning, and slot_breakdown."},
+    
+    def _request_body(self, prompt: str) -> dict:
+        """chat.completions parameters for a prompt (shared by online and Batch API calls)."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_RUBRIC},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
+            "temperature": 0.3,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _with_defaults(self, result: dict) -> dict:
         # Ensure we have the expected structure
         if "preferences_applied" not in result:
             result["preferences_applied"] = []
         if "slot_breakdown" not in result:
             result["slot_breakdown"] = []
-            
         return result
+    
+    def _complete(self, prompt: str) -> dict:
+        """Send one utility prompt and parse the JSON answer."""
+        if self.stream:
+            return json_loads(self._stream_content(prompt))
+        response = self.client.chat.completions.create(**self._request_body(prompt))
+        return json_loads(response.choices[0].message.content)
+    
+    def _stream_content(self, prompt: str) -> str:
+        """
+        Read a streamed completion, collecting content deltas as they arrive.
+        
+        Chunks are drained off the socket while the model is still generating,
+        so only the final join and parse are left once the last token lands.
+        """
+        parts = []
+        append = parts.append
+        stream = self.client.chat.completions.create(**self._request_body(prompt), stream=True)
+        for chunk in stream:
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    append(content)
+        return "".join(parts)
+    
+    def _complete_many(self, prompts: list[str]) -> list[dict]:
+        """
+        Send several utility prompts as one multi-request completion.
+        
+        Any request the model drops (or answers malformed) is retried on its own.
+        """
+        request_ids = [f"r{i}" for i in range(len(prompts))]
+        sections = [
+            f"=== REQUEST {request_id} ===\n{prompt}"
+            for request_id, prompt in zip(request_ids, prompts)
+        ]
+        combined = BATCH_PROMPT_HEADER.format(count=len(prompts)) + "\n\n" + "\n\n".join(sections)
+        
+        answers = self._complete(combined)
+        
+        results = []
+        for request_id, prompt in zip(request_ids, prompts):
+            answer = answers.get(request_id)
+            if not isinstance(answer, dict) or "utilities" not in answer:
+                answer = self._complete(prompt)
+            results.append(answer)
+        return results
 
 
+class UtilityBatcher:
+    """
+    Dynamic request-level batching for OpenAILLM.
+    
+    Callers that arrive within `wait_s` of the first one (up to
+    `max_batch_size`) share a single chat.completions round-trip; the
+    answer is split back out per caller. A lone caller gets a normal call.
+    """
+    
+    def __init__(self, llm: OpenAILLM, max_batch_size: int, wait_s: float):
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.wait_s = wait_s
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, Future]] = []
+    
+    def submit(self, prompt: str) -> dict:
+        """Queue a prompt and block until its (possibly batched) answer is back."""
+        future: Future = Future()
+        batch = None
+        
+        with self._lock:
+            self._pending.append((prompt, future))
+            if len(self._pending) >= self.max_batch_size:
+                # Full - the caller that filled it sends it right away
+                batch = self._take()
+            elif len(self._pending) == 1:
+                # First in a new batch - flush whatever has arrived after the wait
+                threading.Timer(self.wait_s, self._flush).start()
+        
+        if batch:
+            self._run(batch)
+        return future.result()
+    
+    def _take(self) -> list[tuple[str, Future]]:
+        batch, self._pending = self._pending, []
+        return batch
+    
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+    
+    def _run(self, batch: list[tuple[str, Future]]) -> None:
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            if len(prompts) == 1:
+                results = [self.llm._complete(prompts[0])]
+            else:
+                results = self.llm._complete_many(prompts)
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+@lru_cache(maxsize=1)
 def get_llm():
-    """Factory function to get the appropriate LLM based on config."""
+    """
+    Factory function to get the appropriate LLM based on config.
+    
+    Cached so every UserProxyAgent shares one client (and its HTTP connection pool).
+    """
     if config.LLM_MODE == "openai":
         return OpenAILLM()
     else:
@@ -3,28 +3,106 @@ Meeting Safe - Privacy-Preserving Multi-Agent Meeting Scheduler
 
 FastAPI Backend
 """
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+import gzip
+import hashlib
+import threading
 import uuid
 
-from fastapi import FastAPI, Depends, HTTPException
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, model_validator
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config import config
-from database import init_db, get_db, UserDB, CalendarEventDB, DecisionHistoryDB
-from agents.meeting_agent import MeetingAgent
+from database import init_db, get_db, get_async_db, SessionLocal, UserDB, CalendarEventDB, DecisionHistoryDB
+from agents.meeting_agent import MeetingAgent, SLOT_INTERVAL_MINUTES
 from agents.user_proxy_agent import UserProxyAgent
-from models import MeetingRequest
+from llm_service import clock_label
+from models import MeetingRequest, User
+from response_cache import user_responses
 
 app = FastAPI(
     title="Meeting Safe",
-    description="Privacy-Preserving Multi-Agent Meeting Scheduler"
+    description="Privacy-Preserving Multi-Agent Meeting Scheduler",
+    # Every JSON response is encoded with orjson rather than stdlib json
+    default_response_class=ORJSONResponse
 )
 
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip.
+    
+    Honours q-values ("gzip;q=0" refuses it); an explicit gzip entry wins
+    over "*".
+    """
+    qualities = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class AcceptEncodingMiddleware:
+    """
+    Negotiates gzip for the GZipMiddleware inside it.
+    
+    GZipMiddleware only looks for "gzip" anywhere in Accept-Encoding, so the
+    header is rewritten to "gzip" or "identity" as accepts_gzip decides
+    (q-values, "*"). Every response also gets Vary: Accept-Encoding, once.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = b"gzip" if accepts_gzip(Headers(scope=scope).get("accept-encoding", "")) else b"identity"
+        headers = [(name, value) for name, value in scope["headers"] if name != b"accept-encoding"]
+        scope = {**scope, "headers": headers + [(b"accept-encoding", coding)]}
+        
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                vary = {}
+                for name in response_headers.get("vary", "").split(","):
+                    if name.strip():
+                        vary.setdefault(name.strip().lower(), name.strip())
+                vary.setdefault("accept-encoding", "Accept-Encoding")
+                response_headers["vary"] = ", ".join(vary.values())
+            await send(message)
+        
+        await self.app(scope, receive, send_with_vary)
+
+
+# Compress larger responses (API JSON, /static files) for clients that accept
+# gzip. Level 6 keeps per-request CPU low; pages from serve_page arrive
+# already compressed and pass through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=6)
+app.add_middleware(AcceptEncodingMiddleware)
+
 # CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +110,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Serve static files
@@ -40,13 +119,38 @@ static_dir = Path(__file__).parent / "static"
 if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+@lru_cache(maxsize=None)
+def html_page(name: str) -> dict[str, tuple[bytes, dict[str, str]]]:
+    """
+    A shipped page's bytes and headers per content encoding ("identity",
+    "gzip"), read and compressed once per process.
+    """
+    body = (static_dir / name).read_bytes()
+    digest = hashlib.md5(body, usedforsecurity=False).hexdigest()
+    headers = {"cache-control": "public, max-age=300", "vary": "Accept-Encoding"}
+    return {
+        "identity": (body, {**headers, "etag": f'"{digest}"'}),
+        "gzip": (
+            gzip.compress(body, compresslevel=9),
+            {**headers, "etag": f'"{digest}-gzip"', "content-encoding": "gzip"}
+        ),
+    }
+
+def serve_page(request: Request, name: str) -> Response:
+    """Serve a page from memory; a client whose copy is current gets a 304."""
+    encoding = "gzip" if accepts_gzip(request.headers.get("accept-encoding", "")) else "identity"
+    body, headers = html_page(name)[encoding]
+    if request.headers.get("if-none-match") == headers["etag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
 @app.get("/app")
-def serve_app():
-    return FileResponse(str(static_dir / "index.html"))
+async def serve_app(request: Request):
+    return serve_page(request, "index.html")
 
 @app.get("/app/intelligence")
-def serve_intelligence():
-    return FileResponse(str(static_dir / "intelligence.html"))
+async def serve_intelligence(request: Request):
+    return serve_page(request, "intelligence.html")
 
 
 # ============= Request/Response Models =============
@@ -60,6 +164,28 @@ class CreateMeetingRequest(BaseModel):
     window_end: datetime
     meeting_type: str = "internal"
     external: bool = False
+    
+    @model_validator(mode="after")
+    def check_window_size(self) -> "CreateMeetingRequest":
+        # Every candidate slot is hashed and scored by every participant, so
+        # bound the work before any of it starts
+        if self.duration_minutes <= 0:
+            raise ValueError("duration_minutes must be positive")
+        candidate_slots = (self.window_end - self.window_start) / timedelta(minutes=SLOT_INTERVAL_MINUTES)
+        if candidate_slots > config.MAX_MEETING_SLOTS:
+            raise ValueError(
+                f"Scheduling window too wide: {int(candidate_slots)} candidate slots "
+                f"(max {config.MAX_MEETING_SLOTS})"
+            )
+        return self
+
+
+class FinalizeMeetingRequest(BaseModel):
+    winning_time: datetime
+    title: str
+    organizer_id: str
+    participant_ids: list[str]
+    duration_minutes: int = 30
 
 
 class CreateEventRequest(BaseModel):
@@ -79,13 +205,66 @@ class RecordDecisionRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class NaiveSlot(BaseModel):
+    time: str
+    status: str  # "FREE", "BUSY"
+    reason: str
+
+
+class IntelligentSlot(BaseModel):
+    time: str
+    status: str  # "FREE", "PROTECT", "RESCHEDULE_OK", "RELUCTANT"
+    reason: str
+    conflict: Optional[str] = None
+    event_type: Optional[str] = None
+    importance: Optional[int] = None
+
+
+class PreferenceUsed(BaseModel):
+    type: str  # "protect", "reschedule_ok"
+    event_types: list[str]
+
+
+class NaiveView(BaseModel):
+    description: str
+    available_slots: int
+    slots: list[NaiveSlot]
+
+
+class IntelligentView(BaseModel):
+    description: str
+    available_slots: int
+    slots: list[IntelligentSlot]
+    preferences_used: list[PreferenceUsed]
+
+
+class SchedulerComparison(BaseModel):
+    naive: NaiveView
+    intelligent: IntelligentView
+
+
+class NaiveVsIntelligentResponse(BaseModel):
+    user_id: str
+    comparison: SchedulerComparison
+    insight: str
+
+
 # ============= API Endpoints =============
+#
+# Endpoints are async on an AsyncSession. The agents are synchronous, so
+# endpoints that use one run it through AsyncSession.run_sync, which drives
+# the same async connection. Scheduling and finalizing stay sync (threadpool):
+# MeetingAgent fans participants out to worker threads with their own sessions.
 
 @app.on_event("startup")
 def startup():
     init_db()
+    # Seeding is a deploy step (`python seed.py`); checking on every worker
+    # boot costs a query and lets concurrent workers race to seed
+    if not config.AUTO_SEED:
+        return
+    
     # Auto-seed if database is empty
-    from database import SessionLocal
     db = SessionLocal()
     try:
         user_count = db.query(UserDB).count()
@@ -99,101 +278,134 @@ def startup():
 
 
 @app.get("/")
-def root():
+async def root():
     return {"status": "ok", "service": "Meeting Safe", "llm_mode": config.LLM_MODE}
 
 
 # ----- Users -----
 
-@app.get("/api/users")
-def list_users(db: Session = Depends(get_db)):
-    users = db.query(UserDB).all()
-    return [{"id": u.id, "name": u.name, "email": u.email} for u in users]
+@app.get("/api/users", response_model=list[User])
+async def list_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Users ordered by id, one page at a time.
+    
+    Keyset pagination: pass the X-Next-Cursor header of a full page back as
+    `cursor` for the next one (no header means this was the last page).
+    """
+    query = select(UserDB.id, UserDB.name, UserDB.email).order_by(UserDB.id).limit(limit)
+    if cursor is not None:
+        query = query.where(UserDB.id > cursor)
+    
+    # Plain column rows - no ORM instances or identity-map bookkeeping - that
+    # pydantic-core validates and serializes as list[User] in one pass
+    users = (await db.execute(query)).all()
+    if len(users) == limit:
+        response.headers["x-next-cursor"] = users[-1].id
+    return users
 
 
-@app.get("/api/users/{user_id}")
-def get_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(UserDB).filter(UserDB.id == user_id).first()
+@app.get("/api/users/{user_id}", response_model=User)
+async def get_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(UserDB, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"id": user.id, "name": user.name, "email": user.email}
+    return user
 
 
 # ----- Calendar -----
 
 @app.get("/api/users/{user_id}/calendar")
-def get_calendar(
+async def get_calendar(
     user_id: str,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get calendar events for a user."""
+    # Only explicit windows are cached: a window defaulted from now() never
+    # repeats, so caching it would just crowd out the reusable entries
+    cacheable = start is not None
     if not start:
         start = datetime.now()
     if not end:
         end = start + timedelta(days=7)
     
-    agent = UserProxyAgent(user_id, db)
-    events = agent.get_calendar(start, end)
-    return {"user_id": user_id, "events": events}
+    cache_key = ("calendar", start, end)
+    if cacheable:
+        cached = user_responses.get(user_id, cache_key)
+        if cached is not None:
+            return cached
+    
+    events = await db.run_sync(
+        lambda session: UserProxyAgent(user_id, session).get_calendar(start, end)
+    )
+    result = {"user_id": user_id, "events": events}
+    if cacheable:
+        user_responses.put(user_id, cache_key, result)
+    return result
 
 
 @app.post("/api/users/{user_id}/calendar")
-def create_event(
+async def create_event(
     user_id: str,
     event: CreateEventRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add an event to a user's calendar."""
-    new_event = CalendarEventDB(
-        id=str(uuid.uuid4()),
+    # One Core INSERT - no ORM instance or unit-of-work flush for a write-only path
+    event_id = uuid.uuid4().hex
+    await db.execute(insert(CalendarEventDB).values(
+        id=event_id,
         user_id=user_id,
-        title=event.title,
-        start_time=event.start_time,
-        end_time=event.end_time,
-        event_type=event.event_type,
-        external=event.external,
-        importance=event.importance
-    )
-    db.add(new_event)
-    db.commit()
-    return {"id": new_event.id, "status": "created"}
+        **event.model_dump()
+    ))
+    await db.commit()
+    user_responses.invalidate([user_id])
+    return {"id": event_id, "status": "created"}
 
 
 # ----- Decision History (Learning) -----
 
 @app.get("/api/users/{user_id}/decisions")
-def get_decisions(user_id: str, limit: int = 10, db: Session = Depends(get_db)):
+async def get_decisions(user_id: str, limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """Get decision history for learning demo."""
-    agent = UserProxyAgent(user_id, db)
-    decisions = agent.get_decision_history(limit)
+    decisions = await db.run_sync(
+        lambda session: UserProxyAgent(user_id, session).get_decision_history(limit)
+    )
     return {"user_id": user_id, "decisions": decisions}
 
 
 @app.post("/api/users/{user_id}/decisions")
-def record_decision(
+async def record_decision(
     user_id: str,
     decision: RecordDecisionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Record a scheduling decision for future learning."""
-    agent = UserProxyAgent(user_id, db)
-    agent.record_decision(
-        meeting_type=decision.meeting_type,
-        conflicting_type=decision.conflicting_type,
-        recommended_action=decision.recommended_action,
-        user_action=decision.user_action,
-        notes=decision.notes
+    await db.run_sync(
+        lambda session: UserProxyAgent(user_id, session).record_decision(
+            meeting_type=decision.meeting_type,
+            conflicting_type=decision.conflicting_type,
+            recommended_action=decision.recommended_action,
+            user_action=decision.user_action,
+            notes=decision.notes
+        )
     )
+    user_responses.invalidate([user_id])
     return {"status": "recorded"}
 
 
 @app.get("/api/users/{user_id}/preferences")
-def get_preferences(user_id: str, db: Session = Depends(get_db)):
+async def get_preferences(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get learned preferences for a user's agent."""
-    agent = UserProxyAgent(user_id, db)
-    preferences = agent.get_learned_preferences()
+    preferences = await db.run_sync(
+        lambda session: UserProxyAgent(user_id, session).get_learned_preferences()
+    )
     return {"user_id": user_id, "preferences": preferences}
 
 
@@ -213,9 +425,33 @@ def schedule_meeting(
     3. Collect utilities from each participant (privately)
     4. Aggregate and find winner
     5. Only initiator sees the winning time
+    
+    A repeat of the same request (e.g. a double click) within
+    SCHEDULE_MEMO_TTL_S reuses the first result's scores under a fresh
+    meeting_id, as long as no participant's calendar or decisions changed
+    since.
     """
-    meeting_request = MeetingRequest(
-        id=str(uuid.uuid4()),
+    participants = [request.organizer_id] + request.participant_ids
+    memo_key = ("schedule", request.model_dump_json())
+    result = user_responses.get(request.organizer_id, memo_key)
+    # Any participant's write drops their copy, so all must still hold it
+    if result is None or any(user_responses.get(p, memo_key) is not result for p in participants):
+        agent = MeetingAgent(db)
+        result = agent.coordinate_meeting(to_meeting_request(request))
+        for participant_id in participants:
+            user_responses.put(participant_id, memo_key, result, ttl_s=config.SCHEDULE_MEMO_TTL_S)
+    else:
+        # Each response is its own meeting, so finalizing both doesn't collide
+        result = MeetingAgent.with_meeting_id(result, uuid.uuid4().hex)
+    
+    # Large nested dict (per-slot breakdowns, mappings) - serialize with orjson
+    # directly instead of walking it through jsonable_encoder + stdlib json
+    return ORJSONResponse(result)
+
+
+def to_meeting_request(request: CreateMeetingRequest) -> MeetingRequest:
+    return MeetingRequest(
+        id=uuid.uuid4().hex,
         title=request.title,
         organizer_id=request.organizer_id,
         participant_ids=request.participant_ids,
@@ -225,64 +461,128 @@ def schedule_meeting(
         meeting_type=request.meeting_type,
         external=request.external
     )
+
+
+# Background scheduling: coordinations run on a dedicated pool and their
+# futures are kept (most recent MAX_SCHEDULE_TASKS) until polled
+MAX_SCHEDULE_TASKS = 1024
+_schedule_pool = ThreadPoolExecutor(
+    max_workers=config.SCHEDULE_WORKERS,
+    thread_name_prefix="schedule"
+)
+_schedule_tasks: OrderedDict[str, Future] = OrderedDict()
+_schedule_tasks_lock = threading.Lock()
+
+
+def run_schedule(meeting_request: MeetingRequest) -> dict:
+    """Coordinate a meeting on a worker thread, with its own session."""
+    db = SessionLocal()
+    try:
+        return MeetingAgent(db).coordinate_meeting(meeting_request)
+    finally:
+        db.close()
+
+
+@app.post("/api/meetings/schedule/async", status_code=202)
+def schedule_meeting_async(request: CreateMeetingRequest):
+    """
+    Start scheduling in the background and return a task id right away.
     
-    agent = MeetingAgent(db)
-    result = agent.coordinate_meeting(meeting_request)
-    
-    return result
+    Poll GET /api/meetings/tasks/{task_id} for the result. The HTTP worker
+    is free as soon as the job is queued.
+    """
+    task_id = uuid.uuid4().hex
+    future = _schedule_pool.submit(run_schedule, to_meeting_request(request))
+    with _schedule_tasks_lock:
+        _schedule_tasks[task_id] = future
+        while len(_schedule_tasks) > MAX_SCHEDULE_TASKS:
+            _schedule_tasks.popitem(last=False)
+    return {"task_id": task_id, "status": "pending"}
+
+
+@app.get("/api/meetings/tasks/{task_id}")
+def get_schedule_task(task_id: str):
+    """Status of a background scheduling job, with its result once done."""
+    future = _schedule_tasks.get(task_id)
+    if future is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not future.done():
+        return {"task_id": task_id, "status": "pending"}
+    error = future.exception()
+    if error is not None:
+        return {"task_id": task_id, "status": "failed", "error": str(error)}
+    return ORJSONResponse({"task_id": task_id, "status": "done", "result": future.result()})
 
 
 @app.post("/api/meetings/{meeting_id}/finalize")
 def finalize_meeting(
     meeting_id: str,
-    winning_time: datetime,
-    title: str,
-    organizer_id: str,
-    participant_ids: list[str],
-    duration_minutes: int = 30,
+    request: FinalizeMeetingRequest,
     db: Session = Depends(get_db)
 ):
     """Finalize a meeting after user confirms the time."""
     agent = MeetingAgent(db)
     result = agent.finalize_meeting(
         meeting_id=meeting_id,
-        winning_time=winning_time,
-        title=title,
-        organizer_id=organizer_id,
-        participant_ids=participant_ids,
-        duration_minutes=duration_minutes
+        winning_time=request.winning_time,
+        title=request.title,
+        organizer_id=request.organizer_id,
+        participant_ids=request.participant_ids,
+        duration_minutes=request.duration_minutes
     )
+    # The meeting is now on everyone's calendar
+    user_responses.invalidate([request.organizer_id] + request.participant_ids)
     return result
 
 
 # ----- Demo Endpoints -----
 
+# Static payload, encoded once
+PRIVACY_COMPARISON_BODY = orjson.dumps({
+    "traditional_scheduler": {
+        "sees": "All calendars for all users",
+        "learns": "Everyone's availability patterns",
+        "risk": "Central point of data exposure"
+    },
+    "meeting_safe": {
+        "meeting_agent_sees": "Only hashes and utility scores",
+        "hashing_agent_sees": "Nothing (stateless)",
+        "user_proxy_sees": "Only own calendar",
+        "learns": "Individual preferences, privately"
+    }
+})
+PRIVACY_COMPARISON_ETAG = f'"{hashlib.md5(PRIVACY_COMPARISON_BODY, usedforsecurity=False).hexdigest()}"'
+PRIVACY_COMPARISON_HEADERS = {
+    "cache-control": "public, max-age=3600",
+    "etag": PRIVACY_COMPARISON_ETAG
+}
+
+
 @app.get("/api/demo/privacy-comparison")
-def privacy_comparison(db: Session = Depends(get_db)):
+async def privacy_comparison(request: Request):
     """
     Demo endpoint showing what each agent can see.
     
     This is for educational purposes to demonstrate the privacy model.
+    The payload never changes, so it is served pre-encoded with a fixed ETag.
     """
-    return {
-        "traditional_scheduler": {
-            "sees": "All calendars for all users",
-            "learns": "Everyone's availability patterns",
-            "risk": "Central point of data exposure"
-        },
-        "meeting_safe": {
-            "meeting_agent_sees": "Only hashes and utility scores",
-            "hashing_agent_sees": "Nothing (stateless)",
-            "user_proxy_sees": "Only own calendar",
-            "learns": "Individual preferences, privately"
-        }
-    }
+    if request.headers.get("if-none-match") == PRIVACY_COMPARISON_ETAG:
+        return Response(status_code=304, headers=PRIVACY_COMPARISON_HEADERS)
+    return Response(
+        PRIVACY_COMPARISON_BODY,
+        media_type="application/json",
+        headers=PRIVACY_COMPARISON_HEADERS
+    )
 
 
-@app.get("/api/demo/naive-vs-intelligent")
-def naive_vs_intelligent_comparison(
+@app.get(
+    "/api/demo/naive-vs-intelligent",
+    response_model=NaiveVsIntelligentResponse,
+    response_model_exclude_none=True
+)
+async def naive_vs_intelligent_comparison(
     user_id: str = "alice",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Demo endpoint showing the difference between naive and intelligent scheduling.
@@ -290,27 +590,45 @@ def naive_vs_intelligent_comparison(
     Naive: Just checks if slot is free/busy
     Intelligent: Uses learned preferences to make smart tradeoffs
     """
-    from datetime import datetime, timedelta
-    
+    # Keyed by day: "tomorrow" moves at midnight
+    cache_key = ("naive_vs_intelligent", datetime.now().date())
+    cached = user_responses.get(user_id, cache_key)
+    if cached is None:
+        cached = await db.run_sync(_naive_vs_intelligent, user_id)
+        user_responses.put(user_id, cache_key, cached)
+    return cached
+
+
+# Demo day: 9 AM to 5 PM, labelled once ("09:00 AM") instead of strftime per slot
+DEMO_HOURS = range(9, 17)
+DEMO_HOUR_LABELS = {hour: clock_label(hour, 0) for hour in DEMO_HOURS}
+
+
+def _naive_vs_intelligent(db: Session, user_id: str) -> dict:
     agent = UserProxyAgent(user_id, db)
     
-    # Get tomorrow's calendar
+    # Tomorrow's 9 AM - 5 PM slots, with every conflict resolved from one
+    # range query instead of a SELECT per hour
     tomorrow = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-    events = agent.get_calendar(tomorrow, tomorrow + timedelta(hours=12))
+    slot_times = [tomorrow + timedelta(hours=hour) for hour in DEMO_HOURS]
+    conflicts = agent.get_conflicts_for_slots(slot_times, 30)
     decisions = agent.get_decision_history()
     
+    # Learned preferences, collected once for every slot
+    protect_types = {d["conflicting_type"] for d in decisions if d.get("user_action") == "rejected"}
+    reschedule_types = {d["conflicting_type"] for d in decisions if d.get("user_action") == "accepted"}
+    
     # Build naive view (just busy/free)
     naive_slots = []
     intelligent_slots = []
     
-    for hour in range(9, 17):  # 9 AM to 5 PM
-        slot_time = tomorrow + timedelta(hours=hour)
-        conflict = agent.get_conflict_at(slot_time, 30)
+    for hour, conflict in zip(DEMO_HOURS, conflicts):
+        time_label = DEMO_HOUR_LABELS[hour]
         
         if conflict:
             # Naive: just says BUSY
             naive_slots.append({
-                "time": slot_time.strftime("%I:%M %p"),
+                "time": time_label,
                 "status": "BUSY",
                 "reason": f"Conflict with: {conflict['title']}"
             })
@@ -320,10 +638,6 @@ def naive_vs_intelligent_comparison(
             importance = conflict.get("importance", 5)
             event_type = conflict.get("event_type", "meeting")
             
-            # Check learned preferences
-            protect_types = {d["conflicting_type"] for d in decisions if d.get("user_action") == "rejected"}
-            reschedule_types = {d["conflicting_type"] for d in decisions if d.get("user_action") == "accepted"}
-            
             if is_external:
                 intelligent_status = "PROTECT"
                 intelligent_reason = "External meeting - never reschedule"
@@ -344,7 +658,7 @@ def naive_vs_intelligent_comparison(
                 intelligent_reason = f"High importance ({importance}/10)"
             
             intelligent_slots.append({
-                "time": slot_time.strftime("%I:%M %p"),
+                "time": time_label,
                 "status": intelligent_status,
                 "reason": intelligent_reason,
                 "conflict": conflict["title"],
@@ -354,12 +668,12 @@ def naive_vs_intelligent_comparison(
         else:
             # Both systems say FREE
             naive_slots.append({
-                "time": slot_time.strftime("%I:%M %p"),
+                "time": time_label,
                 "status": "FREE",
                 "reason": "No conflict"
             })
             intelligent_slots.append({
-                "time": slot_time.strftime("%I:%M %p"),
+                "time": time_label,
                 "status": "FREE",
                 "reason": "No conflict",
                 "conflict": None
@@ -382,8 +696,8 @@ def naive_vs_intelligent_comparison(
                 "available_slots": intelligent_available,
                 "slots": intelligent_slots,
                 "preferences_used": [
-                    {"type": "protect", "event_types": list({d["conflicting_type"] for d in decisions if d.get("user_action") == "rejected" and d.get("conflicting_type")})},
-                    {"type": "reschedule_ok", "event_types": list({d["conflicting_type"] for d in decisions if d.get("user_action") == "accepted" and d.get("conflicting_type")})}
+                    {"type": "protect", "event_types": [t for t in protect_types if t]},
+                    {"type": "reschedule_ok", "event_types": [t for t in reschedule_types if t]}
                 ]
             }
         },
@@ -393,4 +707,12 @@ def naive_vs_intelligent_comparison(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=config.HOST, port=config.PORT)
+    # Workers are separate processes, so uvicorn needs an import string rather
+    # than the app object. "main:app" is resolved against the current
+    # directory: run `python main.py` from prototype/.
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        workers=config.WORKERS
+    )
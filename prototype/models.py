@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CalendarEvent(BaseModel):
@@ -56,6 +56,9 @@ class TimeSlot(BaseModel):
 
 
 class User(BaseModel):
+    # Built straight from UserDB rows / instances by attribute
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     name: str
     email: str
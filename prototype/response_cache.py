@@ -0,0 +1,57 @@
+"""
+Per-user response cache for read-heavy endpoints.
+
+Calendar and demo views are read far more often than a user's events or
+decisions change, so their payloads are kept in process for a short TTL.
+Any write for a user drops everything cached for that user; the TTL bounds
+staleness when another worker process did the write.
+"""
+import threading
+import time
+from typing import Any, Hashable, Iterable, Optional
+
+from config import config
+
+
+class UserResponseCache:
+    """Payloads keyed by (user_id, key), with a TTL and per-user invalidation."""
+    
+    def __init__(self, ttl_s: float, max_entries_per_user: int = 64):
+        self.ttl_s = ttl_s
+        self.max_entries_per_user = max_entries_per_user
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[Hashable, tuple[float, Any]]] = {}
+    
+    def get(self, user_id: str, key: Hashable) -> Any:
+        """Cached payload, or None if missing or expired."""
+        entry = self._entries.get(user_id, {}).get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def put(self, user_id: str, key: Hashable, payload: Any, ttl_s: Optional[float] = None) -> None:
+        """
+        Store a payload for ttl_s seconds (default: the cache's TTL).
+        
+        A TTL of 0 or less stores nothing, which disables caching.
+        """
+        if ttl_s is None:
+            ttl_s = self.ttl_s
+        if ttl_s <= 0:
+            return
+        with self._lock:
+            user_entries = self._entries.setdefault(user_id, {})
+            if len(user_entries) >= self.max_entries_per_user:
+                # Ad-hoc windows (e.g. "from now") never repeat - start over
+                user_entries.clear()
+            user_entries[key] = (time.monotonic() + ttl_s, payload)
+    
+    def invalidate(self, user_ids: Iterable[str]) -> None:
+        """Drop everything cached for these users (call after any write)."""
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+# Singleton instance
+user_responses = UserResponseCache(config.RESPONSE_CACHE_TTL_S)
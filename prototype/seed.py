@@ -1,390 +1,251 @@
-"""Seed the database with sample users and calendar events."""
+"""
+Seed the database with sample users and calendar events.
+
+Importing this module only defines the sample data; SQLAlchemy, the engine
+and the models are imported by the functions that write to the database.
+"""
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
-from database import SessionLocal, init_db, UserDB, CalendarEventDB, DecisionHistoryDB
-import uuid
+from random import getrandbits
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+    from sqlalchemy.orm import Session
 
-def seed_database():
-    init_db()
-    db = SessionLocal()
-    
-    # Clear existing data
-    db.query(DecisionHistoryDB).delete()
-    db.query(CalendarEventDB).delete()
-    db.query(UserDB).delete()
-    
-    # Create users
-    users = [
-        UserDB(id="alice", name="Alice Chen", email="alice@company.com"),
-        UserDB(id="bob", name="Bob Smith", email="bob@company.com"),
-        UserDB(id="carol", name="Carol Jones", email="carol@company.com"),
-    ]
-    for user in users:
-        db.add(user)
-    
-    # Base date: tomorrow
-    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-    
+
+_ONE_DAY = timedelta(days=1)
+
+# SQLite settings for the load on top of the engine's WAL with
+# synchronous=NORMAL: temp B-trees in RAM and a 64 MB page cache
+SEED_PRAGMAS = {"temp_store": "MEMORY", "cache_size": "-64000"}
+
+# Rows per multi-row INSERT statement (9 columns x 500 rows stays well under
+# SQLite's bound-parameter limit)
+INSERT_PAGE_ROWS = 500
+
+# Event types used by the sample data. Event types are free-form strings
+# (the API accepts any), so these name the seed's vocabulary rather than
+# restrict it; the tables below reference them instead of repeating literals.
+PERSONAL = "personal"
+TEAM_MEETING = "team_meeting"
+CUSTOMER_CALL = "customer_call"
+MANAGER_1ON1 = "manager_1on1"
+INTERNAL_MEETING = "internal_meeting"
+INTERNAL_1ON1 = "internal_1on1"
+EXTERNAL_MEETING = "external_meeting"
+VENDOR_CALL = "vendor_call"
+INTERVIEW = "interview"
+FOCUS_TIME = "focus_time"
+ADMIN = "admin"
+
+# Sample data as plain tuples; seed_database() turns them into rows.
+
+# (id, name, email)
+USERS = (
+    ("alice", "Alice Chen", "alice@company.com"),
+    ("bob", "Bob Smith", "bob@company.com"),
+    ("carol", "Carol Jones", "carol@company.com"),
+)
+
+# (user_id, title, start_hour, start_minute, end_hour, end_minute,
+#  event_type, external, importance, recurring) - times are on the seed day
+EVENTS = (
     # Alice's calendar - busy executive (packed day with mix of 30min and 1hr slots!)
     # FREE slots: 8:30-9am (30m), 9:30-10am (30m), 13:00-14:00 (1hr), 14:30-15:00 (30m), 16:00-16:30 (30m)
-    alice_events = [
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Morning Meditation",
-            start_time=base + timedelta(hours=8),
-            end_time=base + timedelta(hours=8, minutes=30),
-            event_type="personal",
-            external=False,
-            importance=3,
-            recurring=True
-        ),
-        # FREE: 8:30-9:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Team Standup",
-            start_time=base + timedelta(hours=9),
-            end_time=base + timedelta(hours=9, minutes=30),
-            event_type="team_meeting",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        # FREE: 9:30-10:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Customer Call - Acme Corp",
-            start_time=base + timedelta(hours=10),
-            end_time=base + timedelta(hours=11),
-            event_type="customer_call",
-            external=True,
-            importance=9,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Q1 Strategy Review",
-            start_time=base + timedelta(hours=11),
-            end_time=base + timedelta(hours=12),
-            event_type="team_meeting",
-            external=False,
-            importance=7,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Quick Lunch",
-            start_time=base + timedelta(hours=12),
-            end_time=base + timedelta(hours=12, minutes=30),
-            event_type="personal",
-            external=False,
-            importance=2,
-            recurring=True
-        ),
-        # FREE: 12:30-14:00 (1.5 hr slot - great for 1hr meeting)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="1:1 with Manager",
-            start_time=base + timedelta(hours=14),
-            end_time=base + timedelta(hours=14, minutes=30),
-            event_type="manager_1on1",
-            external=False,
-            importance=7,
-            recurring=True
-        ),
-        # FREE: 14:30-15:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Product Review",
-            start_time=base + timedelta(hours=15),
-            end_time=base + timedelta(hours=16),
-            event_type="team_meeting",
-            external=False,
-            importance=6,
-            recurring=False
-        ),
-        # FREE: 16:00-16:30 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            title="Board Prep Call",
-            start_time=base + timedelta(hours=16, minutes=30),
-            end_time=base + timedelta(hours=17),
-            event_type="internal_meeting",
-            external=False,
-            importance=8,
-            recurring=False
-        ),
-    ]
+    ("alice", "Morning Meditation", 8, 0, 8, 30, PERSONAL, False, 3, True),
+    # FREE: 8:30-9:00 (30 min slot)
+    ("alice", "Team Standup", 9, 0, 9, 30, TEAM_MEETING, False, 5, True),
+    # FREE: 9:30-10:00 (30 min slot)
+    ("alice", "Customer Call - Acme Corp", 10, 0, 11, 0, CUSTOMER_CALL, True, 9, False),
+    ("alice", "Q1 Strategy Review", 11, 0, 12, 0, TEAM_MEETING, False, 7, False),
+    ("alice", "Quick Lunch", 12, 0, 12, 30, PERSONAL, False, 2, True),
+    # FREE: 12:30-14:00 (1.5 hr slot - great for 1hr meeting)
+    ("alice", "1:1 with Manager", 14, 0, 14, 30, MANAGER_1ON1, False, 7, True),
+    # FREE: 14:30-15:00 (30 min slot)
+    ("alice", "Product Review", 15, 0, 16, 0, TEAM_MEETING, False, 6, False),
+    # FREE: 16:00-16:30 (30 min slot)
+    ("alice", "Board Prep Call", 16, 30, 17, 0, INTERNAL_MEETING, False, 8, False),
     
     # Bob's calendar - engineer with focus time blocks
     # FREE slots: 8:00-8:30 (30m), 15:30-16:00 (30m)
-    bob_events = [
-        # FREE: 8:00-8:30 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Email & Slack Catchup",
-            start_time=base + timedelta(hours=8, minutes=30),
-            end_time=base + timedelta(hours=9),
-            event_type="admin",
-            external=False,
-            importance=3,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Focus Time - Feature Dev",
-            start_time=base + timedelta(hours=9),
-            end_time=base + timedelta(hours=11),
-            event_type="focus_time",
-            external=False,
-            importance=6,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Code Review Session",
-            start_time=base + timedelta(hours=11),
-            end_time=base + timedelta(hours=11, minutes=30),
-            event_type="team_meeting",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Tech Debt Planning",
-            start_time=base + timedelta(hours=11, minutes=30),
-            end_time=base + timedelta(hours=12),
-            event_type="team_meeting",
-            external=False,
-            importance=4,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Lunch Break",
-            start_time=base + timedelta(hours=12),
-            end_time=base + timedelta(hours=12, minutes=30),
-            event_type="personal",
-            external=False,
-            importance=2,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Mentoring Session",
-            start_time=base + timedelta(hours=12, minutes=30),
-            end_time=base + timedelta(hours=13),
-            event_type="internal_1on1",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Interview - Senior Eng",
-            start_time=base + timedelta(hours=13),
-            end_time=base + timedelta(hours=14),
-            event_type="interview",
-            external=True,
-            importance=8,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Architecture Discussion",
-            start_time=base + timedelta(hours=14),
-            end_time=base + timedelta(hours=15),
-            event_type="team_meeting",
-            external=False,
-            importance=6,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="1:1 with Alice",
-            start_time=base + timedelta(hours=15),
-            end_time=base + timedelta(hours=15, minutes=30),
-            event_type="internal_1on1",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        # FREE: 15:30-16:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="bob",
-            title="Focus Time - Bug Fixes",
-            start_time=base + timedelta(hours=16),
-            end_time=base + timedelta(hours=17),
-            event_type="focus_time",
-            external=False,
-            importance=6,
-            recurring=True
-        ),
-    ]
+    # FREE: 8:00-8:30 (30 min slot)
+    ("bob", "Email & Slack Catchup", 8, 30, 9, 0, ADMIN, False, 3, True),
+    ("bob", "Focus Time - Feature Dev", 9, 0, 11, 0, FOCUS_TIME, False, 6, True),
+    ("bob", "Code Review Session", 11, 0, 11, 30, TEAM_MEETING, False, 5, True),
+    ("bob", "Tech Debt Planning", 11, 30, 12, 0, TEAM_MEETING, False, 4, False),
+    ("bob", "Lunch Break", 12, 0, 12, 30, PERSONAL, False, 2, True),
+    ("bob", "Mentoring Session", 12, 30, 13, 0, INTERNAL_1ON1, False, 5, True),
+    ("bob", "Interview - Senior Eng", 13, 0, 14, 0, INTERVIEW, True, 8, False),
+    ("bob", "Architecture Discussion", 14, 0, 15, 0, TEAM_MEETING, False, 6, False),
+    ("bob", "1:1 with Alice", 15, 0, 15, 30, INTERNAL_1ON1, False, 5, True),
+    # FREE: 15:30-16:00 (30 min slot)
+    ("bob", "Focus Time - Bug Fixes", 16, 0, 17, 0, FOCUS_TIME, False, 6, True),
     
     # Carol's calendar - PM with back-to-back meetings
     # FREE slots: 8:00-9:00 (1hr), 9:30-10:00 (30m), 11:30-12:00 (30m), 12:30-13:00 (30m), 15:00-15:30 (30m)
-    carol_events = [
-        # FREE: 8:00-9:00 (1hr slot!)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Daily Scrum",
-            start_time=base + timedelta(hours=9),
-            end_time=base + timedelta(hours=9, minutes=30),
-            event_type="team_meeting",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        # FREE: 9:30-10:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Sprint Planning",
-            start_time=base + timedelta(hours=10),
-            end_time=base + timedelta(hours=11, minutes=30),
-            event_type="team_meeting",
-            external=False,
-            importance=8,
-            recurring=False
-        ),
-        # FREE: 11:30-12:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Stakeholder Update",
-            start_time=base + timedelta(hours=12),
-            end_time=base + timedelta(hours=12, minutes=30),
-            event_type="external_meeting",
-            external=True,
-            importance=7,
-            recurring=False
-        ),
-        # FREE: 12:30-13:00 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Design Review",
-            start_time=base + timedelta(hours=13),
-            end_time=base + timedelta(hours=14),
-            event_type="team_meeting",
-            external=False,
-            importance=6,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Vendor Call - Tools",
-            start_time=base + timedelta(hours=14),
-            end_time=base + timedelta(hours=14, minutes=30),
-            event_type="vendor_call",
-            external=True,
-            importance=6,
-            recurring=False
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Quick Budget Review",
-            start_time=base + timedelta(hours=14, minutes=30),
-            end_time=base + timedelta(hours=15),
-            event_type="internal_meeting",
-            external=False,
-            importance=4,
-            recurring=False
-        ),
-        # FREE: 15:00-15:30 (30 min slot)
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Backlog Grooming",
-            start_time=base + timedelta(hours=15, minutes=30),
-            end_time=base + timedelta(hours=16, minutes=30),
-            event_type="team_meeting",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
-        CalendarEventDB(
-            id=str(uuid.uuid4()),
-            user_id="carol",
-            title="Customer Success Sync",
-            start_time=base + timedelta(hours=16, minutes=30),
-            end_time=base + timedelta(hours=17),
-            event_type="internal_meeting",
-            external=False,
-            importance=5,
-            recurring=True
-        ),
+    # FREE: 8:00-9:00 (1hr slot!)
+    ("carol", "Daily Scrum", 9, 0, 9, 30, TEAM_MEETING, False, 5, True),
+    # FREE: 9:30-10:00 (30 min slot)
+    ("carol", "Sprint Planning", 10, 0, 11, 30, TEAM_MEETING, False, 8, False),
+    # FREE: 11:30-12:00 (30 min slot)
+    ("carol", "Stakeholder Update", 12, 0, 12, 30, EXTERNAL_MEETING, True, 7, False),
+    # FREE: 12:30-13:00 (30 min slot)
+    ("carol", "Design Review", 13, 0, 14, 0, TEAM_MEETING, False, 6, False),
+    ("carol", "Vendor Call - Tools", 14, 0, 14, 30, VENDOR_CALL, True, 6, False),
+    ("carol", "Quick Budget Review", 14, 30, 15, 0, INTERNAL_MEETING, False, 4, False),
+    # FREE: 15:00-15:30 (30 min slot)
+    ("carol", "Backlog Grooming", 15, 30, 16, 30, TEAM_MEETING, False, 5, True),
+    ("carol", "Customer Success Sync", 16, 30, 17, 0, INTERNAL_MEETING, False, 5, True),
+)
+
+# Some decision history for learning demonstration
+# (user_id, age, meeting_type, conflicting_type, recommended_action, user_action, notes)
+DECISIONS = (
+    ("alice", timedelta(days=5), CUSTOMER_CALL, INTERNAL_1ON1, "reschedule_existing", "accepted",
+     "Rescheduled 1:1 for customer call"),
+    ("alice", timedelta(days=3), INTERNAL_MEETING, MANAGER_1ON1, "reschedule_existing", "rejected",
+     "User protected manager 1:1"),
+    ("alice", timedelta(days=1), CUSTOMER_CALL, TEAM_MEETING, "reschedule_existing", "accepted",
+     "Rescheduled team standup for customer"),
+)
+
+
+def _id() -> str:
+    """Random 32-hex-digit row id (seed data needs no uuid4/urandom strength)."""
+    return f"{getrandbits(128):032x}"
+
+
+def seed_base(now: datetime) -> datetime:
+    """Base date for seeded events: midnight at the start of the day after `now`."""
+    return now.replace(hour=0, minute=0, second=0, microsecond=0) + _ONE_DAY
+
+
+def iter_events(base: datetime):
+    """Event rows for EVENTS on the day starting at `base` (a midnight)."""
+    # replace() sets the fields directly, with no timedelta arithmetic
+    for user_id, title, sh, sm, eh, em, event_type, external, importance, recurring in EVENTS:
+        yield dict(
+            id=_id(),
+            user_id=user_id,
+            title=title,
+            start_time=base.replace(hour=sh, minute=sm),
+            end_time=base.replace(hour=eh, minute=em),
+            event_type=event_type,
+            external=external,
+            importance=importance,
+            recurring=recurring
+        )
+
+
+def build_rows(
+    base: datetime,
+    now: datetime
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    User, event and decision rows for the sample data.
+    
+    Events are on the day of `base` (a midnight); decision timestamps are
+    relative to `now`.
+    """
+    user_rows = [
+        dict(id=user_id, name=name, email=email)
+        for user_id, name, email in USERS
+    ]
+    event_rows = list(iter_events(base))
+    decision_rows = [
+        dict(
+            id=_id(),
+            user_id=user_id,
+            timestamp=now - age,
+            meeting_type=meeting_type,
+            conflicting_type=conflicting_type,
+            recommended_action=recommended_action,
+            user_action=user_action,
+            notes=notes
+        )
+        for user_id, age, meeting_type, conflicting_type, recommended_action, user_action, notes in DECISIONS
     ]
+    return user_rows, event_rows, decision_rows
+
+
+def insert_rows(db: "Session", user_rows: list[dict], event_rows: list[dict], decision_rows: list[dict]):
+    """Replace all users, events and decisions with the given rows (caller commits)."""
+    from sqlalchemy import text
+    from database import UserDB, CalendarEventDB, DecisionHistoryDB
     
-    for event in alice_events + bob_events + carol_events:
-        db.add(event)
+    # Clear existing data with no ORM query/session sync: Postgres drops the
+    # tables' contents in one TRUNCATE (CASCADE also clears meetings organized
+    # by the old users), other databases get one DELETE per table
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text("TRUNCATE TABLE decision_history, calendar_events, users CASCADE"))
+    else:
+        db.execute(DecisionHistoryDB.__table__.delete())
+        db.execute(CalendarEventDB.__table__.delete())
+        db.execute(UserDB.__table__.delete())
     
-    # Add some decision history for learning demonstration
-    decisions = [
-        DecisionHistoryDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            timestamp=datetime.now() - timedelta(days=5),
-            meeting_type="customer_call",
-            conflicting_type="internal_1on1",
-            recommended_action="reschedule_existing",
-            user_action="accepted",
-            notes="Rescheduled 1:1 for customer call"
-        ),
-        DecisionHistoryDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            timestamp=datetime.now() - timedelta(days=3),
-            meeting_type="internal_meeting",
-            conflicting_type="manager_1on1",
-            recommended_action="reschedule_existing",
-            user_action="rejected",
-            notes="User protected manager 1:1"
-        ),
-        DecisionHistoryDB(
-            id=str(uuid.uuid4()),
-            user_id="alice",
-            timestamp=datetime.now() - timedelta(days=1),
-            meeting_type="customer_call",
-            conflicting_type="team_meeting",
-            recommended_action="reschedule_existing",
-            user_action="accepted",
-            notes="Rescheduled team standup for customer"
-        ),
-    ]
+    # Rows are plain dicts sent as multi-row INSERT ... VALUES statements -
+    # no ORM objects or flush bookkeeping at all
+    _insert_values(db, UserDB.__table__, user_rows)
+    _insert_values(db, CalendarEventDB.__table__, event_rows)
+    _insert_values(db, DecisionHistoryDB.__table__, decision_rows)
+
+
+def _insert_values(db: "Session", table: "Table", rows: list[dict]):
+    """
+    Insert rows with one INSERT ... VALUES (...), (...), ... per page.
+    
+    Each page is parsed and executed once instead of once per row; the
+    dialect picks the placeholder style.
+    """
+    for i in range(0, len(rows), INSERT_PAGE_ROWS):
+        db.execute(table.insert().values(rows[i:i + INSERT_PAGE_ROWS]))
+
+
+@contextmanager
+def _load_pragmas(db: "Session"):
+    """
+    Apply SEED_PRAGMAS to the session's connection for the duration of the block.
     
-    for decision in decisions:
-        db.add(decision)
+    PRAGMAs belong to the connection, which goes back to the pool afterwards,
+    so the previous values are restored on the way out (even if the load
+    failed and the transaction is being rolled back).
+    """
+    dbapi_connection = db.connection().connection.dbapi_connection
+    saved = {
+        name: dbapi_connection.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in SEED_PRAGMAS
+    }
+    for name, value in SEED_PRAGMAS.items():
+        dbapi_connection.execute(f"PRAGMA {name}={value}")
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            dbapi_connection.execute(f"PRAGMA {name}={value}")
+
+
+def seed_database():
+    from database import SessionLocal, init_db, is_sqlite
+    
+    init_db()
+    # One clock read shared by events and decisions
+    now = datetime.now()
+    base = seed_base(now)
+    user_rows, event_rows, decision_rows = build_rows(base, now)
     
-    db.commit()
-    db.close()
+    # One explicit transaction for the whole seed: clearing and every insert
+    # commit (and hit the journal) once, when the block exits
+    with SessionLocal(expire_on_commit=False) as db, db.begin():
+        with _load_pragmas(db) if is_sqlite else nullcontext():
+            insert_rows(db, user_rows, event_rows, decision_rows)
     
-    print("✅ Database seeded with sample data:")
-    print("   - 3 users (Alice, Bob, Carol)")
-    print("   - Calendar events for each user")
-    print("   - Decision history for Alice (learning demo)")
+    print(
+        "✅ Database seeded with sample data:\n"
+        "   - 3 users (Alice, Bob, Carol)\n"
+        "   - Calendar events for each user\n"
+        "   - Decision history for Alice (learning demo)"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""
+Shared fixtures: a throwaway SQLite database seeded with the sample data,
+and a TestClient for the API. Run from prototype/: `python -m pytest`.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Configure before any app module reads config/creates the engine
+_db_dir = tempfile.mkdtemp(prefix="meeting-safe-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["LLM_MODE"] = "mock"
+os.environ["AUTO_SEED"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import seed  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from response_cache import user_responses  # noqa: E402
+
+SEED_USERS = [user_id for user_id, _, _ in seed.USERS]
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    """Fresh sample data (and no cached responses) for every test."""
+    seed.seed_database()
+    user_responses.invalidate(SEED_USERS)
+    yield
+
+
+@pytest.fixture
+def base() -> datetime:
+    """Midnight of the seeded day."""
+    return seed.seed_base(datetime.now())
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    
+    with TestClient(main.app) as test_client:
+        yield test_client
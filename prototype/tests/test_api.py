@@ -0,0 +1,140 @@
+"""API behaviour around caching, pagination and request validation."""
+from datetime import timedelta
+
+import orjson
+import pytest
+
+from agents.meeting_agent import MeetingAgent, SLOT_INTERVAL_MINUTES
+from config import config
+from main import CreateMeetingRequest, to_meeting_request
+from response_cache import user_responses
+from seed import USERS
+
+SEED_USERS = [user_id for user_id, _, _ in USERS]
+
+
+def calendar_entries(user_id: str) -> int:
+    return len(user_responses._entries.get(user_id, {}))
+
+
+def test_calendar_caches_explicit_windows_only(client, base):
+    params = {"start": base.isoformat(), "end": (base + timedelta(days=1)).isoformat()}
+    first = client.get("/api/users/bob/calendar", params=params).json()
+    assert calendar_entries("bob") == 1
+    assert client.get("/api/users/bob/calendar", params=params).json() == first
+    assert calendar_entries("bob") == 1
+    
+    for _ in range(3):
+        assert client.get("/api/users/bob/calendar").status_code == 200
+    assert calendar_entries("bob") == 1
+
+
+def test_calendar_cache_dropped_on_new_event(client, base):
+    params = {"start": base.isoformat(), "end": (base + timedelta(days=1)).isoformat()}
+    before = client.get("/api/users/bob/calendar", params=params).json()["events"]
+    
+    client.post("/api/users/bob/calendar", json={
+        "title": "Dentist",
+        "start_time": (base + timedelta(hours=7)).isoformat(),
+        "end_time": (base + timedelta(hours=7, minutes=30)).isoformat(),
+        "event_type": "personal"
+    })
+    
+    after = client.get("/api/users/bob/calendar", params=params).json()["events"]
+    assert len(after) == len(before) + 1
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0.5, br", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, *", None),
+    ("identity", None),
+])
+def test_encoding_negotiation(client, accept_encoding, expected):
+    for path in ("/app", "/api/users/alice/calendar"):
+        response = client.get(path, headers={"accept-encoding": accept_encoding})
+        assert response.headers.get("content-encoding") == expected
+        assert response.headers["vary"].lower().count("accept-encoding") == 1
+    
+    # Below GZipMiddleware's minimum size: never compressed, still varies
+    small = client.get("/api/users", headers={"accept-encoding": accept_encoding})
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"].lower().count("accept-encoding") == 1
+    
+    page = client.get("/app", headers={"accept-encoding": accept_encoding})
+    not_modified = client.get("/app", headers={
+        "accept-encoding": accept_encoding, "if-none-match": page.headers["etag"]
+    })
+    assert not_modified.status_code == 304
+    assert not_modified.headers["vary"].lower().count("accept-encoding") == 1
+
+
+def test_users_pages_follow_the_cursor(client):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 1} if cursor is None else {"limit": 1, "cursor": cursor}
+        response = client.get("/api/users", params=params)
+        ids += [user["id"] for user in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert ids == sorted(SEED_USERS)
+
+
+def test_users_full_last_page_ends_with_an_empty_page(client):
+    response = client.get("/api/users", params={"limit": len(SEED_USERS)})
+    assert len(response.json()) == len(SEED_USERS)
+    cursor = response.headers["x-next-cursor"]
+    
+    last = client.get("/api/users", params={"limit": len(SEED_USERS), "cursor": cursor})
+    assert last.json() == []
+    assert "x-next-cursor" not in last.headers
+    
+    short = client.get("/api/users", params={"limit": len(SEED_USERS) + 1})
+    assert "x-next-cursor" not in short.headers
+
+
+@pytest.mark.parametrize("limit", [0, 1001])
+def test_users_limit_out_of_range(client, limit):
+    assert client.get("/api/users", params={"limit": limit}).status_code == 422
+
+
+def meeting(base, days=1, **overrides) -> dict:
+    return {
+        "title": "Sync",
+        "organizer_id": "alice",
+        "participant_ids": ["bob", "carol"],
+        "window_start": base.isoformat(),
+        "window_end": (base + timedelta(days=days)).isoformat(),
+        **overrides
+    }
+
+
+def test_schedule_rejects_oversized_window(client, base):
+    max_days = config.MAX_MEETING_SLOTS * SLOT_INTERVAL_MINUTES // (24 * 60)
+    assert client.post("/api/meetings/schedule", json=meeting(base, days=max_days)).status_code == 200
+    assert client.post("/api/meetings/schedule", json=meeting(base, days=max_days + 1)).status_code == 422
+    assert client.post("/api/meetings/schedule", json=meeting(base, duration_minutes=0)).status_code == 422
+
+
+def test_schedule_memo_issues_fresh_meeting_ids(client, db, base):
+    first = client.post("/api/meetings/schedule", json=meeting(base)).json()
+    second = client.post("/api/meetings/schedule", json=meeting(base)).json()
+    assert second["meeting_id"] != first["meeting_id"]
+    
+    # The memoized scores come back re-hashed exactly as a fresh run under that id would
+    request = to_meeting_request(CreateMeetingRequest(**meeting(base))).model_copy(
+        update={"id": second["meeting_id"]}
+    )
+    assert second == orjson.loads(orjson.dumps(MeetingAgent(db).coordinate_meeting(request)))
+    
+    for result in (first, second):
+        response = client.post(f"/api/meetings/{result['meeting_id']}/finalize", json={
+            "winning_time": result["initiator_view"]["winning_time"],
+            "title": "Sync",
+            "organizer_id": "alice",
+            "participant_ids": ["bob", "carol"],
+        })
+        assert response.status_code == 200
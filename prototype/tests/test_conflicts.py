@@ -0,0 +1,78 @@
+"""Slot conflict lookup: bisect over preloaded events vs the per-slot SQL query."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.user_proxy_agent import UserProxyAgent
+from database import CalendarEventDB
+
+
+def sql_conflict(db, user_id: str, time: datetime, duration_minutes: int):
+    """The original per-slot lookup: every overlapping event, straight from SQL."""
+    end_time = time + timedelta(minutes=duration_minutes)
+    return db.query(CalendarEventDB).filter(
+        CalendarEventDB.user_id == user_id,
+        CalendarEventDB.start_time < end_time,
+        CalendarEventDB.end_time > time
+    ).all()
+
+
+def assert_same_conflict(found, overlapping):
+    if not overlapping:
+        assert found is None
+        return
+    top = max(e.importance for e in overlapping)
+    assert found is not None
+    assert found["importance"] == top
+    assert found["id"] in {e.id for e in overlapping if e.importance == top}
+
+
+def slot_grid(base: datetime, tz=None) -> list[datetime]:
+    """Every quarter hour from 7:00 to 18:00 on the seeded day."""
+    start = base.replace(hour=7, tzinfo=tz)
+    return [start + timedelta(minutes=15 * i) for i in range(45)]
+
+
+@pytest.mark.parametrize("user_id", ["alice", "bob", "carol"])
+@pytest.mark.parametrize("duration_minutes", [15, 30, 60, 90])
+@pytest.mark.parametrize("tz", [None, timezone.utc], ids=["naive", "aware"])
+def test_conflicts_match_sql(db, base, user_id, duration_minutes, tz):
+    times = slot_grid(base, tz)
+    agent = UserProxyAgent(user_id, db)
+    
+    conflicts = agent.get_conflicts_for_slots(times, duration_minutes)
+    
+    assert len(conflicts) == len(times)
+    for time, found in zip(times, conflicts):
+        assert_same_conflict(found, sql_conflict(db, user_id, time, duration_minutes))
+        assert_same_conflict(
+            agent.get_conflict_at(time, duration_minutes),
+            sql_conflict(db, user_id, time, duration_minutes)
+        )
+
+
+@pytest.mark.parametrize("tz", [None, timezone.utc], ids=["naive", "aware"])
+def test_preloaded_conflicts_match_sql(db, base, tz):
+    times = slot_grid(base, tz)
+    agents = UserProxyAgent.load_many(
+        ["alice", "bob", "carol"], db, times[0], times[-1] + timedelta(minutes=30)
+    )
+    
+    for user_id, agent in agents.items():
+        for time, found in zip(times, agent.get_conflicts_for_slots(times, 30)):
+            assert_same_conflict(found, sql_conflict(db, user_id, time, 30))
+
+
+def test_schedule_with_utc_window(client, base):
+    day = base.date().isoformat()
+    response = client.post("/api/meetings/schedule", json={
+        "title": "Sync",
+        "organizer_id": "alice",
+        "participant_ids": ["bob", "carol"],
+        "duration_minutes": 30,
+        "window_start": f"{day}T08:00:00Z",
+        "window_end": f"{day}T18:00:00Z",
+    })
+    
+    assert response.status_code == 200
+    assert response.json()["meeting_agent_view"]["winning_hash"]
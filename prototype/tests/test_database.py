@@ -0,0 +1,48 @@
+"""Engine setup for the configured DATABASE_URL (checked in fresh interpreters)."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROTOTYPE_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_with_database(url: str, code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROTOTYPE_DIR,
+        env={**os.environ, "DATABASE_URL": url},
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_in_memory_sqlite_is_one_database():
+    out = run_with_database("sqlite://", """
+from fastapi.testclient import TestClient
+import main
+import seed
+from database import SessionLocal, UserDB
+seed.seed_database()
+with SessionLocal() as first, SessionLocal() as second:
+    print(first.query(UserDB).count(), second.query(UserDB).count())
+with TestClient(main.app) as client:
+    print(len(client.get("/api/users").json()))
+""")
+    assert out.splitlines()[-2:] == ["3 3", "3"]
+
+
+def test_unsupported_backend_is_named():
+    result = subprocess.run(
+        [sys.executable, "-c", "import database"],
+        cwd=PROTOTYPE_DIR,
+        env={**os.environ, "DATABASE_URL": "mysql://user@localhost/meetings"},
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode != 0
+    assert "Unsupported database backend 'mysql'" in result.stderr
@@ -0,0 +1,165 @@
+"""MockLLM scoring (memoization, isolation of shared entries), prompt preferences and UtilityBatcher."""
+import threading
+
+from llm_service import FACTOR_BASE_FREE, PROMPT_DECISIONS, MockLLM, UtilityBatcher, build_preferences
+
+MEETING = {
+    "title": "Sync",
+    "organizer_id": "alice",
+    "meeting_type": "internal_meeting",
+    "external": False,
+    "duration_minutes": 30
+}
+
+SLOTS = [
+    {"hash": "h1", "time": "2026-01-05T09:00:00", "status": "free", "conflict_event": None},
+    {"hash": "h2", "time": "2026-01-05T10:00:00", "status": "conflict", "conflict_event": {
+        "title": "Standup", "event_type": "team_meeting", "importance": 5, "external": False
+    }},
+]
+
+
+def score(llm: MockLLM, slots=SLOTS, decisions=()):
+    return llm.calculate_utilities("bob", "Bob", MEETING, [dict(s) for s in slots], list(decisions))
+
+
+def test_mutating_a_result_leaves_later_results_intact():
+    llm = MockLLM()
+    first = score(llm)
+    expected = score(MockLLM())
+    
+    for breakdown in first["slot_breakdown"]:
+        breakdown["factors"][0]["value"] = -1
+        breakdown["factors"].append({"type": "bogus"})
+        if breakdown["conflict"]:
+            breakdown["conflict"]["importance"] = 99
+    first["utilities"]["h1"] = -1
+    
+    assert score(llm) == expected
+    assert score(MockLLM()) == expected
+    assert FACTOR_BASE_FREE["value"] == 80
+
+
+def test_memo_hit_matches_a_fresh_score():
+    llm = MockLLM()
+    first = score(llm)
+    second = score(llm)
+    
+    assert len(llm._cache) == 1
+    assert second == first == score(MockLLM())
+    assert second is not first
+    assert second["slot_breakdown"][0]["factors"] is not first["slot_breakdown"][0]["factors"]
+
+
+def test_memo_hits_across_meetings():
+    llm = MockLLM()
+    first = score(llm)
+    rehashed = [{**slot, "hash": f"other-{slot['hash']}"} for slot in SLOTS]
+    second = score(llm, slots=rehashed)
+    
+    assert len(llm._cache) == 1
+    assert second == score(MockLLM(), slots=rehashed)
+    assert list(second["utilities"]) == ["other-h1", "other-h2"]
+    assert list(second["utilities"].values()) == list(first["utilities"].values())
+
+
+def test_changed_inputs_miss_the_memo():
+    llm = MockLLM()
+    baseline = score(llm)
+    
+    edited = [SLOTS[0], {**SLOTS[1], "conflict_event": {**SLOTS[1]["conflict_event"], "importance": 2}}]
+    assert score(llm, slots=edited)["utilities"]["h2"] != baseline["utilities"]["h2"]
+    
+    rejected = [{"conflicting_type": "team_meeting", "user_action": "rejected"}]
+    assert score(llm, decisions=rejected)["utilities"]["h2"] != baseline["utilities"]["h2"]
+    
+    assert len(llm._cache) == 3
+    assert score(llm) == baseline
+
+
+def test_memo_is_bounded():
+    llm = MockLLM()
+    llm.cache_size = 2
+    for importance in (1, 5, 9):
+        score(llm, slots=[{**SLOTS[1], "conflict_event": {**SLOTS[1]["conflict_event"], "importance": importance}}])
+    assert len(llm._cache) == 2
+
+
+def test_prompt_keeps_the_most_relevant_decisions():
+    def decision(conflicting_type):
+        return {"user_action": "accepted", "conflicting_type": conflicting_type, "meeting_type": "internal_meeting"}
+    
+    # Newest first, as from get_decision_history: recent but irrelevant ones lead
+    decisions = [decision("focus_time")] * 6 + [decision("team_meeting")] * 4
+    lines = build_preferences(decisions, {"team_meeting"}).splitlines()
+    
+    assert len(lines) == PROMPT_DECISIONS
+    assert sum("team_meeting" in line for line in lines) == 4
+    assert sum("focus_time" in line for line in lines) == 1
+
+
+class EchoLLM:
+    """Stands in for OpenAILLM: answers each prompt with itself and records the calls."""
+    
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+    
+    def _complete(self, prompt: str) -> dict:
+        self.calls.append([prompt])
+        if self.error:
+            raise self.error
+        return {"prompt": prompt}
+    
+    def _complete_many(self, prompts: list[str]) -> list[dict]:
+        self.calls.append(prompts)
+        if self.error:
+            raise self.error
+        return [{"prompt": prompt} for prompt in prompts]
+
+
+def submit_concurrently(batcher: UtilityBatcher, prompts: list[str]) -> list:
+    results = [None] * len(prompts)
+    
+    def run(i):
+        try:
+            results[i] = batcher.submit(prompts[i])
+        except Exception as exc:
+            results[i] = exc
+    
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(prompts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_batcher_lone_caller_gets_a_single_call():
+    llm = EchoLLM()
+    assert UtilityBatcher(llm, max_batch_size=4, wait_s=0.01).submit("p0") == {"prompt": "p0"}
+    assert llm.calls == [["p0"]]
+
+
+def test_batcher_full_batch_shares_one_call():
+    llm = EchoLLM()
+    prompts = ["p0", "p1", "p2"]
+    results = submit_concurrently(UtilityBatcher(llm, max_batch_size=3, wait_s=0.5), prompts)
+    
+    assert results == [{"prompt": prompt} for prompt in prompts]
+    assert len(llm.calls) == 1
+    assert sorted(llm.calls[0]) == prompts
+
+
+def test_batcher_flushes_a_partial_batch_after_the_wait():
+    llm = EchoLLM()
+    results = submit_concurrently(UtilityBatcher(llm, max_batch_size=10, wait_s=0.2), ["p0", "p1"])
+    
+    assert results == [{"prompt": "p0"}, {"prompt": "p1"}]
+    assert sum(len(call) for call in llm.calls) == 2
+
+
+def test_batcher_failure_reaches_every_caller():
+    error = RuntimeError("upstream down")
+    results = submit_concurrently(UtilityBatcher(EchoLLM(error), max_batch_size=2, wait_s=0.5), ["p0", "p1"])
+    assert results == [error, error]
@@ -0,0 +1,22 @@
+"""UserResponseCache TTL handling."""
+from response_cache import UserResponseCache
+
+
+def test_default_and_explicit_ttl():
+    cache = UserResponseCache(ttl_s=60)
+    cache.put("alice", "default", 1)
+    cache.put("alice", "explicit", 2, ttl_s=30)
+    assert cache.get("alice", "default") == 1
+    assert cache.get("alice", "explicit") == 2
+
+
+def test_non_positive_ttl_disables_caching():
+    cache = UserResponseCache(ttl_s=60)
+    cache.put("alice", "zero", 1, ttl_s=0)
+    cache.put("alice", "negative", 2, ttl_s=-1)
+    assert cache.get("alice", "zero") is None
+    assert cache.get("alice", "negative") is None
+    
+    disabled = UserResponseCache(ttl_s=0)
+    disabled.put("alice", "default", 3)
+    assert disabled.get("alice", "default") is None
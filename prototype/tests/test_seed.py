@@ -0,0 +1,26 @@
+"""Sample data loading."""
+import pytest
+
+import seed
+from database import SessionLocal
+
+
+def pragmas(db) -> dict:
+    return {name: db.connection().exec_driver_sql(f"PRAGMA {name}").scalar() for name in seed.SEED_PRAGMAS}
+
+
+def test_load_pragmas_are_restored():
+    with SessionLocal() as db, db.begin():
+        before = pragmas(db)
+        with seed._load_pragmas(db):
+            assert pragmas(db) == {"temp_store": 2, "cache_size": -64000}
+        assert pragmas(db) == before
+
+
+def test_load_pragmas_are_restored_after_a_failed_load():
+    with SessionLocal() as db, db.begin():
+        before = pragmas(db)
+        with pytest.raises(RuntimeError):
+            with seed._load_pragmas(db):
+                raise RuntimeError("load failed")
+        assert pragmas(db) == before
@@ -0,0 +1,76 @@
+"""UserProxyAgent: preloading and memoized decision history / preferences."""
+from datetime import timedelta
+
+from agents.user_proxy_agent import PRELOADED_DECISIONS, UserProxyAgent
+
+
+def record(agent: UserProxyAgent, n: int, conflicting_type: str = "team_meeting", user_action: str = "accepted"):
+    for i in range(n):
+        agent.record_decision(
+            meeting_type="internal_meeting",
+            conflicting_type=conflicting_type,
+            recommended_action="reschedule_existing",
+            user_action=user_action,
+            notes=f"decision {i}"
+        )
+
+
+def test_preload_keeps_only_recent_decisions(db, base):
+    record(UserProxyAgent("bob", db), PRELOADED_DECISIONS + 5)
+    full = UserProxyAgent("bob", db).get_decision_history(limit=50)
+    
+    agent = UserProxyAgent.load_many(["bob"], db, base, base + timedelta(days=1))["bob"]
+    
+    assert len(agent._recent_history) == PRELOADED_DECISIONS
+    assert agent.get_decision_history() == full[:10]
+    # Longer histories than the preload still come from the database
+    assert agent.get_decision_history(limit=50) == full
+    assert len(full) == PRELOADED_DECISIONS + 5
+
+
+def test_preload_history_matches_query(db, base):
+    agents = UserProxyAgent.load_many(["alice", "bob"], db, base, base + timedelta(days=1))
+    
+    for user_id, agent in agents.items():
+        assert agent.get_decision_history() == UserProxyAgent(user_id, db).get_decision_history()
+
+
+def test_record_decision_refreshes_memoized_reads(db):
+    agent = UserProxyAgent("bob", db)
+    before_history = agent.get_decision_history()
+    before_prefs = agent.get_learned_preferences()
+    assert before_history == []
+    assert "vendor_call" not in before_prefs["protect_events"]
+    
+    record(agent, 1, conflicting_type="vendor_call", user_action="rejected")
+    
+    history = agent.get_decision_history()
+    assert len(history) == 1
+    assert history[0]["conflicting_type"] == "vendor_call"
+    assert agent.get_learned_preferences()["protect_events"] == ["vendor_call"]
+
+
+def test_record_decision_refreshes_preloaded_history(db, base):
+    agent = UserProxyAgent.load_many(["alice"], db, base, base + timedelta(days=1))["alice"]
+    assert len(agent.get_decision_history()) == 3
+    
+    record(agent, 1)
+    
+    assert len(agent.get_decision_history()) == 4
+
+
+def test_decisions_api_reflects_recorded_decision(client):
+    assert client.get("/api/users/bob/decisions").json()["decisions"] == []
+    
+    response = client.post("/api/users/bob/decisions", json={
+        "meeting_type": "internal_meeting",
+        "conflicting_type": "focus_time",
+        "recommended_action": "reschedule_existing",
+        "user_action": "rejected"
+    })
+    assert response.status_code == 200
+    
+    decisions = client.get("/api/users/bob/decisions").json()["decisions"]
+    assert [d["conflicting_type"] for d in decisions] == ["focus_time"]
+    preferences = client.get("/api/users/bob/preferences").json()["preferences"]
+    assert preferences["protect_events"] == ["focus_time"]